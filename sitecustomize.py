@@ -2,10 +2,11 @@
 Python auto-imports sitecustomize if present on sys.path; project root is on sys.path when you run from here.
 """
 
+import os
 import sys
-from pathlib import Path
 
-root = Path(__file__).resolve().parent
-src = root / "src"
-if src.exists():
-    sys.path.insert(0, str(src))
+# os.path keeps this cheap: sitecustomize runs on every interpreter start-up,
+# and importing pathlib plus resolve() costs more than the check itself.
+src = os.path.join(os.path.dirname(os.path.abspath(__file__)), "src")
+if src not in sys.path and os.path.isdir(src):
+    sys.path.insert(0, src)
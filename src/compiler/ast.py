@@ -6,160 +6,207 @@ from dataclasses import dataclass
 from typing import List, Optional, Union
 
 
-# Base node for location info
-@dataclass(kw_only=True)
+# Base node. Every node has `line` and `col`, which may be None. Concrete
+# nodes end with them as fields, so they can be passed positionally after
+# the node's own fields; the class-level Nones here cover any other node.
+@dataclass(slots=True)
 class Node:
-    line: Optional[int] = None
-    col: Optional[int] = None
+    line = None
+    col = None
 
 
 # Expressions
-@dataclass
+@dataclass(slots=True)
 class Expr(Node):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class Number(Expr):
     value: str  # keep raw lexeme; convert later if needed
+    is_float: bool  # lexeme has a fractional part
+    line: Optional[int] = None
+    col: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class String(Expr):
     value: str
+    line: Optional[int] = None
+    col: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Var(Expr):
     name: str
+    line: Optional[int] = None
+    col: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Unary(Expr):
     op: str
     right: Expr
+    line: Optional[int] = None
+    col: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Binary(Expr):
     left: Expr
     op: str
     right: Expr
+    line: Optional[int] = None
+    col: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Power(Expr):
     base: Expr
     exponent: Expr
+    line: Optional[int] = None
+    col: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Index(Expr):
     name: str
     index: Expr
+    line: Optional[int] = None
+    col: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Stmt(Node):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class Program(Node):
     functions: List["Function"]
     statements: List[Stmt]
+    line: Optional[int] = None
+    col: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Assign(Stmt):
     name: str
     expr: Expr
     type: Optional[str] = None
+    line: Optional[int] = None
+    col: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class IndexAssign(Stmt):
     name: str
     index: Expr
     expr: Expr
+    line: Optional[int] = None
+    col: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Declaration(Stmt):
     name: str
     type: Optional[str] = None
     size: Optional[Expr] = None
+    line: Optional[int] = None
+    col: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Input(Stmt):
     name: str
     type: Optional[str] = None
     prompt: Optional[str] = None
+    line: Optional[int] = None
+    col: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Print(Stmt):
     values: List[Expr]
+    line: Optional[int] = None
+    col: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Return(Stmt):
     values: List[Expr]
+    line: Optional[int] = None
+    col: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class IfBranch(Node):
     cond: Expr
     body: List[Stmt]
+    line: Optional[int] = None
+    col: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class If(Stmt):
     first: IfBranch
     elifs: List[IfBranch]
     else_body: Optional[List[Stmt]]
+    line: Optional[int] = None
+    col: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class While(Stmt):
     cond: Expr
     body: List[Stmt]
+    line: Optional[int] = None
+    col: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class For(Stmt):
     var: str
     start: Expr
     end: Expr
     body: List[Stmt]
+    line: Optional[int] = None
+    col: Optional[int] = None
 
 
 # Functions
-@dataclass
+@dataclass(slots=True)
 class Param(Node):
     name: str
     type: Optional[str] = None
     default: Optional[Expr] = None
+    line: Optional[int] = None
+    col: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Arg(Node):
     name: Optional[str]
     value: Expr
+    line: Optional[int] = None
+    col: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Call(Stmt):
     name: str
     args: List[Arg]
+    line: Optional[int] = None
+    col: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Function(Node):
     name: str
     params: List[Param]
     body: List[Stmt]
+    line: Optional[int] = None
+    col: Optional[int] = None
 
 
 __all__ = [
@@ -5,55 +5,115 @@ Emits a self-contained C++ program (int/float, iostream, cmath). No semantic/typ
 
 from __future__ import annotations
 
+import io
+import os
 import re
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, TextIO, Tuple, Union
 
 from . import ast
 
+_CPP_TYPE = {
+    "int": "int",
+    "float": "float",
+    "string": "string",
+    "bool": "bool",
+    "list": "std::vector<double>",
+    "array": "std::vector<double>",
+}
+_WORD_OPS = {
+    "add": "+",
+    "subtract": "-",
+    "multiply": "*",
+    "divide": "/",
+}
+_NUMERIC_OPS = frozenset({"+", "-", "*", "/", "add", "subtract", "multiply", "divide"})
+_BOOL_OPS = frozenset({"==", "!=", ">", "<", ">=", "<=", "and", "or", "&", "|"})
+_NUMERIC_TYPES = frozenset({"int", "float"})
+_VECTOR_TYPES = frozenset({"list", "array"})
+_IDENT_RE = re.compile(r"[^0-9A-Za-z_]")
+# Source escapes (\" \\ \n ...) already match C++; only raw line breaks from
+# multi-line Write strings are illegal inside a C++ literal.
+_RAW_NEWLINE_ESCAPES = str.maketrans({"\n": "\\n", "\r": "\\r"})
+
+# Includes and runtime helpers, emitted verbatim at the top of every program.
+_PRELUDE = """\
+#include <iostream>
+#include <cmath>
+#include <string>
+#include <tuple>
+#include <vector>
+#include <sstream>
+using namespace std;
+
+// Runtime helpers (keep small; ready for future library extraction)
+namespace write_runtime {
+    template <typename T>
+    inline void read_value(T& v) { cin >> v; }
+    inline void read_value(std::string& v) { getline(cin >> ws, v); }
+    inline std::string fmt_vector(const std::vector<double>& v) {
+        std::ostringstream oss;
+        oss << '[';
+        for (size_t i = 0; i < v.size(); ++i) {
+            if (i) oss << ", ";
+            oss << v[i];
+        }
+        oss << ']';
+        return oss.str();
+    }
+} // namespace write_runtime
+
+"""
+
 
 class Codegen:
+    _STMT_DISPATCH: Dict[type, Callable[["Codegen", ast.Stmt], None]]
+    _EXPR_DISPATCH: Dict[
+        type, Callable[["Codegen", ast.Expr, io.StringIO], Optional[str]]
+    ]
+
     def __init__(self):
-        self.lines: List[str] = []
+        self._buf: TextIO = io.StringIO()
+        self._indents: List[str] = [""]
         self.indent = 0
         self.env: Dict[str, str] = {}
+        self._returns_value = False
+        self._func_name_cache: Dict[str, str] = {}
+        self._str_lit_cache: Dict[str, str] = {}
 
     def generate(self, program: ast.Program) -> str:
-        self.lines = []
+        out = io.StringIO()
+        self._generate_into(program, out)
+        return out.getvalue()
+
+    def generate_to(
+        self, program: ast.Program, dest: Union[str, os.PathLike, TextIO]
+    ) -> None:
+        """Write the C++ for ``program`` straight to a path or text stream.
+
+        A path is only replaced once emission has finished; if it fails, any
+        existing file there is left as it was.
+        """
+        if hasattr(dest, "write"):
+            self._generate_into(program, dest)
+            return
+        path = os.fspath(dest)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8", buffering=1 << 20) as fh:
+                self._generate_into(program, fh)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+
+    def _generate_into(self, program: ast.Program, out: TextIO) -> None:
+        self._buf = out
         self.indent = 0
         self.env = {}
-        self._emit("#include <iostream>")
-        self._emit("#include <cmath>")
-        self._emit("#include <string>")
-        self._emit("#include <tuple>")
-        self._emit("#include <vector>")
-        self._emit("#include <sstream>")
-        self._emit("using namespace std;")
-        self._emit("")
-        self._emit(
-            "// Runtime helpers (keep small; ready for future library extraction)"
-        )
-        self._emit("namespace write_runtime {")
-        self._push()
-        self._emit("template <typename T>")
-        self._emit("inline void read_value(T& v) { cin >> v; }")
-        self._emit("inline void read_value(std::string& v) { getline(cin >> ws, v); }")
-        self._emit("inline std::string fmt_vector(const std::vector<double>& v) {")
-        self._push()
-        self._emit("std::ostringstream oss;")
-        self._emit("oss << '[';")
-        self._emit("for (size_t i = 0; i < v.size(); ++i) {")
-        self._push()
-        self._emit('if (i) oss << ", ";')
-        self._emit("oss << v[i];")
-        self._pop()
-        self._emit("}")
-        self._emit("oss << ']';")
-        self._emit("return oss.str();")
-        self._pop()
-        self._emit("}")
-        self._pop()
-        self._emit("} // namespace write_runtime")
-        self._emit("")
+        self._buf.write(_PRELUDE)
         for fn in program.functions:
             self._emit_function(fn)
             self._emit("")
@@ -66,93 +126,90 @@ class Codegen:
         self._emit("return 0;")
         self._pop()
         self._emit("}")
-        return "\n".join(self.lines)
 
     # --- statements ---
     def _stmt(self, node: ast.Stmt):
-        if isinstance(node, ast.Declaration):
-            declared_type = node.type or "float"
-            cpp_type = self._cpp_type(declared_type)
-            self.env[node.name] = declared_type
-            if node.type in {"list", "array"}:
-                if node.size is not None:
-                    size_code, _ = self._expr(node.size)
-                    self._emit(f"{cpp_type} {node.name}({size_code}, 0.0);")
-                else:
-                    self._emit(f"{cpp_type} {node.name};")
+        handler = self._STMT_DISPATCH.get(type(node))
+        if handler is None:
+            raise TypeError(f"Unhandled stmt: {node}")
+        handler(self, node)
+
+    def _emit_decl(self, node: ast.Declaration):
+        declared_type = node.type or "float"
+        cpp_type = _CPP_TYPE.get(declared_type, "auto")
+        self.env[node.name] = declared_type
+        if node.type in _VECTOR_TYPES:
+            if node.size is not None:
+                size_code, _ = self._expr_code(node.size)
+                self._emit(f"{cpp_type} {node.name}({size_code}, 0.0);")
             else:
-                init_suffix = " = 0.0" if declared_type == "float" else ""
-                self._emit(f"{cpp_type} {node.name}{init_suffix};")
-            return
-        if isinstance(node, ast.Input):
-            if node.type:
-                cpp_type = self._cpp_type(node.type)
-                self.env[node.name] = node.type
                 self._emit(f"{cpp_type} {node.name};")
-            prompt = node.prompt
-            self._emit_input(node.name, self.env.get(node.name), prompt)
-            return
-        if isinstance(node, ast.Assign):
-            expr, expr_type = self._expr(node.expr)
-            declared = getattr(node, "type", None)
-            if node.name in self.env:
-                self._emit(f"{node.name} = {expr};")
-                if declared:
-                    self.env[node.name] = declared
-            else:
-                decl_type = self._cpp_type(declared or expr_type or "auto")
-                self.env[node.name] = declared or expr_type or "auto"
-                self._emit(f"{decl_type} {node.name} = {expr};")
-            return
-        if isinstance(node, ast.IndexAssign):
-            idx_code, _ = self._expr(node.index)
-            expr_code, _ = self._expr(node.expr)
-            self._emit(f"{node.name}[{idx_code}] = {expr_code};")
-            return
-        if isinstance(node, ast.Print):
-            parts = []
-            for v in node.values:
-                code, typ = self._expr(v)
-                parts.append(self._format_for_stream(code, typ))
-            joined = " << ".join(parts) if parts else '""'
-            self._emit(f"cout << {joined} << endl;")
-            return
-        if isinstance(node, ast.If):
-            self._if_stmt(node)
-            return
-        if isinstance(node, ast.While):
-            cond, _ = self._expr(node.cond)
-            self._emit(f"while ({cond}) {{")
-            self._push()
-            for s in node.body:
-                self._stmt(s)
-            self._pop()
-            self._emit("}")
-            return
-        if isinstance(node, ast.For):
-            start, _ = self._expr(node.start)
-            end, _ = self._expr(node.end)
-            self._emit(
-                f"for (auto {node.var} = {start}; {node.var} <= {end}; ++{node.var}) {{"
-            )
-            self._push()
-            for s in node.body:
-                self._stmt(s)
-            self._pop()
-            self._emit("}")
-            return
-        if isinstance(node, ast.Call):
-            args_code = [self._expr(a.value)[0] for a in node.args]
-            call = f"{self._func_name(node.name)}({', '.join(args_code)})"
-            self._emit(call + ";")
-            return
-        if isinstance(node, ast.Return):
-            self._emit_return(node)
-            return
-        raise TypeError(f"Unhandled stmt: {node}")
+        else:
+            init_suffix = " = 0.0" if declared_type == "float" else ""
+            self._emit(f"{cpp_type} {node.name}{init_suffix};")
+
+    def _emit_input_stmt(self, node: ast.Input):
+        if node.type:
+            cpp_type = _CPP_TYPE.get(node.type, "auto")
+            self.env[node.name] = node.type
+            self._emit(f"{cpp_type} {node.name};")
+        self._emit_input(node.name, node.prompt)
+
+    def _emit_assign(self, node: ast.Assign):
+        expr, expr_type = self._expr_code(node.expr)
+        declared = node.type
+        env = self.env
+        name = node.name
+        if name in env:
+            self._emit(f"{name} = {expr};")
+            if declared:
+                env[name] = declared
+        else:
+            resolved = declared or expr_type or "auto"
+            env[name] = resolved
+            self._emit(f"{_CPP_TYPE.get(resolved, 'auto')} {name} = {expr};")
+
+    def _emit_index_assign(self, node: ast.IndexAssign):
+        idx_code, _ = self._expr_code(node.index)
+        expr_code, _ = self._expr_code(node.expr)
+        self._emit(f"{node.name}[{idx_code}] = {expr_code};")
+
+    def _emit_print(self, node: ast.Print):
+        parts = []
+        for v in node.values:
+            code, typ = self._expr_code(v)
+            parts.append(self._format_for_stream(code, typ))
+        joined = " << ".join(parts) if parts else '""'
+        self._emit(f"cout << {joined} << endl;")
+
+    def _emit_while(self, node: ast.While):
+        cond, _ = self._expr_code(node.cond)
+        self._emit(f"while ({cond}) {{")
+        self._push()
+        for s in node.body:
+            self._stmt(s)
+        self._pop()
+        self._emit("}")
+
+    def _emit_for(self, node: ast.For):
+        start, _ = self._expr_code(node.start)
+        end, _ = self._expr_code(node.end)
+        self._emit(
+            f"for (auto {node.var} = {start}; {node.var} <= {end}; ++{node.var}) {{"
+        )
+        self._push()
+        for s in node.body:
+            self._stmt(s)
+        self._pop()
+        self._emit("}")
+
+    def _emit_call(self, node: ast.Call):
+        args_code = [self._expr_code(a.value)[0] for a in node.args]
+        call = f"{self._func_name(node.name)}({', '.join(args_code)})"
+        self._emit(call + ";")
 
     def _if_stmt(self, node: ast.If):
-        cond, _ = self._expr(node.first.cond)
+        cond, _ = self._expr_code(node.first.cond)
         self._emit(f"if ({cond}) {{")
         self._push()
         for s in node.first.body:
@@ -160,7 +217,7 @@ class Codegen:
         self._pop()
         self._emit("}")
         for br in node.elifs:
-            cond, _ = self._expr(br.cond)
+            cond, _ = self._expr_code(br.cond)
             self._emit(f"else if ({cond}) {{")
             self._push()
             for s in br.body:
@@ -182,158 +239,186 @@ class Codegen:
 
         param_strings: List[str] = []
         for idx, p in enumerate(fn.params):
-            cpp_type = self._cpp_type(p.type or "auto")
+            cpp_type = _CPP_TYPE.get(p.type, "auto")
             if p.name not in self.env:
                 self.env[p.name] = p.type or "auto"
             default_src = ""
             if p.default is not None:
-                default_code, _ = self._expr(p.default)
+                default_code, _ = self._expr_code(p.default)
                 default_src = f" = {default_code}"
             param_strings.append(f"{cpp_type} {p.name}{default_src}")
 
-        returns_value, returns_multi = self._function_returns(fn.body)
-        ret_type = "auto" if returns_value else "void"
-        signature = f"{ret_type} {fn_name}({', '.join(param_strings)})"
-        self._emit(signature + " {")
+        # Emit the body once into a scratch buffer; Return handlers record
+        # whether a value is returned so the signature can be built after.
+        outer_buf = self._buf
+        self._buf = io.StringIO()
+        self._returns_value = False
         self._push()
         for stmt in fn.body:
             self._stmt(stmt)
-        if returns_value is False and not returns_multi:
-            pass
         self._pop()
+        body_code = self._buf.getvalue()
+        self._buf = outer_buf
+
+        ret_type = "auto" if self._returns_value else "void"
+        signature = f"{ret_type} {fn_name}({', '.join(param_strings)})"
+        self._emit(signature + " {")
+        self._buf.write(body_code)
         self._emit("}")
         self.env = prev_env
 
-    def _function_returns(self, body: List[ast.Stmt]) -> tuple[bool, bool]:
-        returns_value = False
-        returns_multi = False
-        for stmt in body:
-            if isinstance(stmt, ast.Return):
-                if stmt.values:
-                    returns_value = True
-                    if len(stmt.values) > 1:
-                        returns_multi = True
-                else:
-                    returns_value = False or returns_value
-            elif isinstance(stmt, (ast.If, ast.While, ast.For)):
-                # shallow scan nested blocks
-                nested_body = []
-                if isinstance(stmt, ast.If):
-                    nested_body.extend(stmt.first.body)
-                    for br in stmt.elifs:
-                        nested_body.extend(br.body)
-                    if stmt.else_body:
-                        nested_body.extend(stmt.else_body)
-                elif isinstance(stmt, ast.While):
-                    nested_body.extend(stmt.body)
-                elif isinstance(stmt, ast.For):
-                    nested_body.extend(stmt.body)
-                nested_ret_val, nested_multi = self._function_returns(nested_body)
-                returns_value = returns_value or nested_ret_val
-                returns_multi = returns_multi or nested_multi
-        return returns_value, returns_multi
-
     # --- expressions ---
-    def _expr(self, node: ast.Expr) -> Tuple[str, Optional[str]]:
-        if isinstance(node, ast.Number):
-            typ = "float" if "." in node.value else "int"
-            return node.value, typ
-        if isinstance(node, ast.String):
-            return f'"{node.value}"', "string"
-        if isinstance(node, ast.Var):
-            return node.name, self.env.get(node.name)
-        if isinstance(node, ast.Index):
-            idx_code, _ = self._expr(node.index)
-            return f"{node.name}[{idx_code}]", "float"
-        if isinstance(node, ast.Unary):
-            inner, typ = self._expr(node.right)
-            op = "!" if node.op == "not" else node.op
-            result_type = "bool" if op == "!" else typ
-            return f"({op}{inner})", result_type
-        if isinstance(node, ast.Binary):
-            left_code, left_type = self._expr(node.left)
-            right_code, right_type = self._expr(node.right)
-            op = self._map_bin_op(node.op)
-            result_type = self._binary_result_type(node.op, left_type, right_type)
-            return f"({left_code} {op} {right_code})", result_type
-        if isinstance(node, ast.Power):
-            base_code, base_type = self._expr(node.base)
-            exp_code, exp_type = self._expr(node.exponent)
-            result_type: Optional[str] = None
-            if base_type in {"int", "float"} and exp_type in {"int", "float"}:
-                result_type = "float" if "float" in (base_type, exp_type) else "int"
-            return f"pow({base_code}, {exp_code})", result_type
-        raise TypeError(f"Unhandled expr: {node}")
+    def _expr_code(self, node: ast.Expr) -> Tuple[str, Optional[str]]:
+        out = io.StringIO()
+        typ = self._expr(node, out)
+        return out.getvalue(), typ
+
+    def _expr(self, node: ast.Expr, out: io.StringIO) -> Optional[str]:
+        cls = type(node)
+        # Var and Number leaves make up most expression visits, so they are
+        # emitted here and have no entry in _EXPR_DISPATCH.
+        if cls is ast.Var:
+            out.write(node.name)
+            return self.env.get(node.name)
+        if cls is ast.Number:
+            out.write(node.value)
+            return "float" if node.is_float else "int"
+        handler = self._EXPR_DISPATCH.get(cls)
+        if handler is None:
+            raise TypeError(f"Unhandled expr: {node}")
+        return handler(self, node, out)
+
+    def _string_expr(self, node: ast.String, out: io.StringIO) -> Optional[str]:
+        out.write(self._string_literal(node.value))
+        return "string"
+
+    def _string_literal(self, value: str) -> str:
+        cached = self._str_lit_cache.get(value)
+        if cached is None:
+            body = value
+            if "\n" in body or "\r" in body:
+                body = body.translate(_RAW_NEWLINE_ESCAPES)
+            cached = f'"{body}"'
+            self._str_lit_cache[value] = cached
+        return cached
+
+    def _index_expr(self, node: ast.Index, out: io.StringIO) -> Optional[str]:
+        out.write(node.name)
+        out.write("[")
+        self._expr(node.index, out)
+        out.write("]")
+        return "float"
+
+    def _unary_expr(self, node: ast.Unary, out: io.StringIO) -> Optional[str]:
+        op = "!" if node.op == "not" else node.op
+        out.write("(")
+        out.write(op)
+        typ = self._expr(node.right, out)
+        out.write(")")
+        return "bool" if op == "!" else typ
+
+    def _binary_expr(self, node: ast.Binary, out: io.StringIO) -> Optional[str]:
+        op = node.op
+        out.write("(")
+        left_type = self._expr(node.left, out)
+        out.write(" ")
+        out.write(_WORD_OPS.get(op, op))
+        out.write(" ")
+        right_type = self._expr(node.right, out)
+        out.write(")")
+        return self._binary_result_type(op, left_type, right_type)
+
+    def _power_expr(self, node: ast.Power, out: io.StringIO) -> Optional[str]:
+        out.write("pow(")
+        base_type = self._expr(node.base, out)
+        out.write(", ")
+        exp_type = self._expr(node.exponent, out)
+        out.write(")")
+        if base_type in _NUMERIC_TYPES and exp_type in _NUMERIC_TYPES:
+            return "float" if base_type == "float" or exp_type == "float" else "int"
+        return None
 
     def _emit_return(self, node: ast.Return):
         if not node.values:
             self._emit("return;")
             return
-        parts = [self._expr(v)[0] for v in node.values]
+        self._returns_value = True
+        parts = [self._expr_code(v)[0] for v in node.values]
         if len(parts) == 1:
             self._emit(f"return {parts[0]};")
         else:
             joined = ", ".join(parts)
             self._emit(f"return std::make_tuple({joined});")
 
-    def _map_bin_op(self, op: str) -> str:
-        word_ops = {
-            "add": "+",
-            "subtract": "-",
-            "multiply": "*",
-            "divide": "/",
-        }
-        return word_ops.get(op, op)
-
     def _binary_result_type(
         self, op: str, left: Optional[str], right: Optional[str]
     ) -> Optional[str]:
-        numeric_ops = {"+", "-", "*", "/", "add", "subtract", "multiply", "divide"}
-        if op in numeric_ops:
-            if "float" in (left, right):
+        if op in _NUMERIC_OPS:
+            if left == "float" or right == "float":
                 return "float"
-            if left == "int" and right == "int":
+            if left == "int" == right:
                 return "int"
             return left or right
-        if op in {"==", "!=", ">", "<", ">=", "<=", "and", "or", "&", "|"}:
+        if op in _BOOL_OPS:
             return "bool"
         return None
 
-    def _cpp_type(self, typ: str) -> str:
-        return {
-            "int": "int",
-            "float": "float",
-            "string": "string",
-            "bool": "bool",
-            "list": "std::vector<double>",
-            "array": "std::vector<double>",
-        }.get(typ, "auto")
-
     def _format_for_stream(self, code: str, typ: Optional[str]) -> str:
-        if typ in {"list", "array"}:
-            return f"write_runtime::fmt_vector({code})"
-        return code
+        return f"write_runtime::fmt_vector({code})" if typ in _VECTOR_TYPES else code
 
-    def _emit_input(self, name: str, typ: Optional[str], prompt: Optional[str]):
+    def _emit_input(self, name: str, prompt: Optional[str]):
         if prompt:
-            self._emit(f'cout << "{prompt}"; cout.flush();')
+            self._emit(f"cout << {self._string_literal(prompt)}; cout.flush();")
         self._emit(f"write_runtime::read_value({name});")
 
     # --- helpers ---
     def _emit(self, line: str):
-        self.lines.append("    " * self.indent + line)
+        buf = self._buf
+        buf.write(self._indents[self.indent])
+        buf.write(line)
+        buf.write("\n")
 
     def _push(self):
         self.indent += 1
+        if self.indent == len(self._indents):
+            self._indents.append("    " * self.indent)
 
     def _pop(self):
         self.indent = max(0, self.indent - 1)
 
     def _func_name(self, raw: str) -> str:
-        safe = re.sub(r"[^0-9A-Za-z_]", "_", raw)
+        cached = self._func_name_cache.get(raw)
+        if cached is not None:
+            return cached
+        safe = _IDENT_RE.sub("_", raw)
         if safe and safe[0].isdigit():
             safe = "fn_" + safe
-        return safe or "fn"
+        safe = safe or "fn"
+        self._func_name_cache[raw] = safe
+        return safe
+
+
+# Node type -> unbound handler; AST node classes are never subclassed, so an
+# exact ``type(node)`` lookup replaces the isinstance cascade.
+Codegen._STMT_DISPATCH = {
+    ast.Declaration: Codegen._emit_decl,
+    ast.Input: Codegen._emit_input_stmt,
+    ast.Assign: Codegen._emit_assign,
+    ast.IndexAssign: Codegen._emit_index_assign,
+    ast.Print: Codegen._emit_print,
+    ast.If: Codegen._if_stmt,
+    ast.While: Codegen._emit_while,
+    ast.For: Codegen._emit_for,
+    ast.Call: Codegen._emit_call,
+    ast.Return: Codegen._emit_return,
+}
+Codegen._EXPR_DISPATCH = {
+    ast.String: Codegen._string_expr,
+    ast.Index: Codegen._index_expr,
+    ast.Unary: Codegen._unary_expr,
+    ast.Binary: Codegen._binary_expr,
+    ast.Power: Codegen._power_expr,
+}
 
 
 __all__ = ["Codegen"]
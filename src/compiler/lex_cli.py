@@ -1,31 +1,58 @@
-"""Simple CLI to lex a Write source file and print tokens."""
+"""Simple CLI to lex Write source files and print tokens."""
 
 import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import List, Optional, Tuple
 
 from .lexer import Lexer, LexerError
 
 
-def main() -> int:
-    parser = argparse.ArgumentParser(description="Lex a Write source file")
-    parser.add_argument("path", type=Path, help="Path to Write source (.write)")
-    args = parser.parse_args()
-
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Lex Write source files")
+    parser.add_argument(
+        "paths", type=Path, nargs="+", help="Path(s) to Write source (.write)"
+    )
+    args = parser.parse_args(argv)
+
+    if len(args.paths) == 1:
+        # Skip pool start-up for the common single-file case.
+        results = [_lex_one(args.paths[0])]
+    else:
+        workers = min(len(args.paths), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_lex_one, args.paths))
+
+    status = 0
+    multi = len(args.paths) > 1
+    for path, (lines, error) in zip(args.paths, results):
+        if multi:
+            print(f"==> {path} <==")
+        if error is not None:
+            print(error)
+            status = 1
+            continue
+        for line in lines:
+            print(line)
+    return status
+
+
+def _lex_one(path: Path) -> Tuple[List[str], Optional[str]]:
+    """Lex one file in a worker; returns (formatted token lines, error message)."""
     try:
-        text = args.path.read_text(encoding="utf-8")
+        text = path.read_text(encoding="utf-8")
     except FileNotFoundError:
-        print(f"error: file not found: {args.path}")
-        return 1
+        return [], f"error: file not found: {path}"
 
     try:
-        tokens = Lexer(text).scan()
+        tokens = Lexer(text).scan_tuples()
     except LexerError as e:
-        print(f"lexer error: {e}")
-        return 1
+        return [], f"lexer error: {e}"
 
-    for t in tokens:
-        print(f"{t.kind.name}\t{t.lexeme!r}\t(line {t.line})")
-    return 0
+    return [
+        f"{kind.name}\t{lexeme!r}\t(line {line})" for kind, lexeme, line, _ in tokens
+    ], None
 
 
 if __name__ == "__main__":
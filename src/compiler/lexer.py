@@ -5,12 +5,18 @@ Tokenizes keywords, identifiers, numbers, strings, and operators per spec/lexer.
 This is a minimal scaffold; fill in scan logic next.
 """
 
+import re
+import string
+import sys
+from array import array
 from dataclasses import dataclass
-from enum import Enum, auto
-from typing import List, Optional
+from enum import IntEnum, auto
+from typing import Callable, Iterable, List, Tuple
 
 
-class TokenKind(Enum):
+class TokenKind(IntEnum):
+    # IntEnum so kinds hash as plain ints: set/dict lookups keyed on a kind
+    # skip Enum's Python-level __hash__.
     # Single / multi-char operators
     PLUS = auto()
     MINUS = auto()
@@ -45,59 +51,110 @@ class TokenKind(Enum):
     EOF = auto()
 
 
-KEYWORDS = {
-    "set",
-    "to",
-    "print",
-    "make",
-    "input",
-    "as",
-    "if",
-    "else",
-    "end",
-    "then",
-    "while",
-    "do",
-    "for",
-    "from",
-    "and",
-    "or",
-    "not",
-    "is",
-    "greater",
-    "less",
-    "equal",
-    "than",
-    # arithmetic words can be treated as keywords if desired
-    "add",
-    "subtract",
-    "sub",
-    "multiply",
-    "divide",
-    "power",
-    "int",
-    "float",
-    "string",
-    "bool",
-    "list",
-    "array",
-    "return",
-    "of",
-    "size",
-    # functions
-    "function",
-    "func",
-    "end_function",
-    "end_func",
-    "arguments",
-    "arg",
-    "args",
-    "with",
-    "call",
+KEYWORDS = frozenset(
+    sys.intern(kw)
+    for kw in (
+        "set",
+        "to",
+        "print",
+        "make",
+        "input",
+        "as",
+        "if",
+        "else",
+        "end",
+        "then",
+        "while",
+        "do",
+        "for",
+        "from",
+        "and",
+        "or",
+        "not",
+        "is",
+        "greater",
+        "less",
+        "equal",
+        "than",
+        # arithmetic words can be treated as keywords if desired
+        "add",
+        "subtract",
+        "sub",
+        "multiply",
+        "divide",
+        "power",
+        "int",
+        "float",
+        "string",
+        "bool",
+        "list",
+        "array",
+        "return",
+        "of",
+        "size",
+        # functions
+        "function",
+        "func",
+        "end_function",
+        "end_func",
+        "arguments",
+        "arg",
+        "args",
+        "with",
+        "call",
+    )
+)
+
+# Keyword text -> its interned instance; one lookup both classifies an
+# identifier and yields the shared lexeme object for the token.
+_KEYWORD_LEXEMES = {kw: kw for kw in KEYWORDS}
+
+
+# First-character classes for ASCII; other characters classify as 0 and
+# fall through to the operator tables / slow path in scan().
+_CC_SPACE = 1
+_CC_DIGIT = 2
+_CC_IDENT = 3
+_CHAR_CLASS = {
+    **{ch: _CC_SPACE for ch in " \t\r\n"},
+    **{ch: _CC_DIGIT for ch in string.digits},
+    **{ch: _CC_IDENT for ch in string.ascii_letters + "_"},
+}
+
+_WS_RE = re.compile(r"[ \t\r\n]+")
+# NUMBER per spec/lexer.md; digits are ASCII-only.
+_NUMBER_RE = re.compile(r"[0-9]+(?:\.[0-9]+)?")
+# Identifier continuation; \w is exactly str.isalnum() plus '_'.
+_IDENT_TAIL_RE = re.compile(r"\w*")
+
+# Operators that are always exactly one character.
+_SINGLE_CHAR_TOKENS = {
+    "&": TokenKind.AMP,
+    "|": TokenKind.PIPE,
+    "+": TokenKind.PLUS,
+    "-": TokenKind.MINUS,
+    "*": TokenKind.STAR,
+    "/": TokenKind.SLASH,
+    "^": TokenKind.CARET,
+    "(": TokenKind.LPAREN,
+    ")": TokenKind.RPAREN,
+    "[": TokenKind.LBRACKET,
+    "]": TokenKind.RBRACKET,
+    ",": TokenKind.COMMA,
+    ":": TokenKind.COLON,
+}
+
+# Operators that become a two-character operator when followed by '=':
+# char -> (kind alone, kind with trailing '=').
+_EQ_SUFFIX_TOKENS = {
+    "=": (TokenKind.EQ, TokenKind.EQEQ),
+    "!": (TokenKind.BANG, TokenKind.NEQ),
+    ">": (TokenKind.GT, TokenKind.GTE),
+    "<": (TokenKind.LT, TokenKind.LTE),
 }
 
 
-@dataclass
+@dataclass(slots=True)
 class Token:
     kind: TokenKind
     lexeme: str
@@ -105,8 +162,48 @@ class Token:
     col: int
 
 
+# Plain-tuple form of a token: (kind, lexeme, line, col).
+TokenTuple = Tuple[TokenKind, str, int, int]
+
+
+def _pack(kind: TokenKind, lexeme: str, line: int, col: int) -> TokenTuple:
+    return (kind, lexeme, line, col)
+
+
+class TokenStream:
+    """Column-oriented token storage: one sequence per Token field.
+
+    Indexing builds a Token on demand, so this can stand in for List[Token].
+    """
+
+    __slots__ = ("kinds", "lexemes", "lines", "cols")
+
+    def __init__(self, tokens: Iterable[TokenTuple]):
+        kinds, lexemes, lines, cols = zip(*tokens)
+        self.kinds: List[TokenKind] = list(kinds)
+        self.lexemes: List[str] = list(lexemes)
+        self.lines = array("i", lines)
+        self.cols = array("i", cols)
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def __getitem__(self, i: int) -> Token:
+        return Token(self.kinds[i], self.lexemes[i], self.lines[i], self.cols[i])
+
+
 class LexerError(Exception):
-    pass
+    """Lexing failure at a source position; the message is formatted on demand."""
+
+    def __init__(self, pos: int, line: int, col: int, msg: str):
+        super().__init__(pos, line, col, msg)
+        self.pos = pos
+        self.line = line
+        self.col = col
+        self.msg = msg
+
+    def __str__(self) -> str:
+        return f"{self.msg} at {self.line}:{self.col}"
 
 
 class Lexer:
@@ -115,186 +212,151 @@ class Lexer:
         self.length = len(source)
         self.pos = 0
         self.line = 1
-        self.col = 1
-        self.tokens: List[Token] = []
+        # Index of the first character of the current line; columns are
+        # derived from it when a token is emitted instead of tracked per char.
+        self._line_start = 0
+        self.tokens: list = []
         self.start = 0
 
     def scan(self) -> List[Token]:
-        while not self._is_at_end():
-            self.start = self.pos
-            c = self._advance()
-
-            # Whitespace / newlines
-            if c in " \t\r":
-                continue
-            if c == "\n":
-                self.line += 1
-                self.col = 1
+        return self._scan(Token)
+
+    def scan_tuples(self) -> List[TokenTuple]:
+        """Scan into (kind, lexeme, line, col) tuples, skipping Token objects.
+
+        Cheaper than scan() for consumers that walk the stream once.
+        """
+        return self._scan(_pack)
+
+    def scan_stream(self) -> TokenStream:
+        return TokenStream(self._scan(_pack))
+
+    def _scan(self, make: Callable[[TokenKind, str, int, int], object]) -> list:
+        # Loop state and the grammar tables/kinds live in locals and the common
+        # token kinds are scanned inline; attributes are synced only around the
+        # _string sub-scanner.
+        source = self.source
+        length = self.length
+        ws_match = _WS_RE.match
+        ident_tail = _IDENT_TAIL_RE.match
+        number_match = _NUMBER_RE.match
+        char_class = _CHAR_CLASS.get
+        keyword_lexeme = _KEYWORD_LEXEMES.get
+        single_char = _SINGLE_CHAR_TOKENS.get
+        eq_suffix = _EQ_SUFFIX_TOKENS.get
+        KEYWORD, IDENT, NUMBER = TokenKind.KEYWORD, TokenKind.IDENT, TokenKind.NUMBER
+        append = self.tokens.append
+        pos = self.pos
+        line = self.line
+        line_start = self._line_start
+        while pos < length:
+            c = source[pos]
+            cls = char_class(c, 0)
+
+            # Whitespace / newlines: consume the whole run at once
+            if cls == _CC_SPACE:
+                end = ws_match(source, pos).end()
+                nl = source.count("\n", pos, end)
+                if nl:
+                    line += nl
+                    line_start = source.rindex("\n", pos, end) + 1
+                pos = end
                 continue
 
-            # Comment (line, starting with #)
-            if c == "#":
-                self._skip_until_newline()
-                continue
+            start = pos
+            pos += 1
 
-            # Strings
-            if c == '"':
-                self._string()
+            # Ident / keyword (non-ASCII letters also start identifiers)
+            if cls == _CC_IDENT or (c > "\x7f" and c.isalpha()):
+                pos = ident_tail(source, pos).end()
+                text = source[start:pos]
+                kw = keyword_lexeme(text)
+                if kw is not None:
+                    append(make(KEYWORD, kw, line, start - line_start + 1))
+                else:
+                    append(make(IDENT, text, line, start - line_start + 1))
                 continue
 
             # Numbers
-            if c.isdigit():
-                self._number()
+            if cls == _CC_DIGIT:
+                pos = number_match(source, start).end()
+                text = source[start:pos]
+                append(make(NUMBER, text, line, start - line_start + 1))
                 continue
 
-            # Ident / keyword
-            if c.isalpha() or c == "_":
-                self._identifier()
+            # Operators / punctuation (longest match handled by the '=' suffix table)
+            kind = single_char(c)
+            if kind is not None:
+                append(make(kind, c, line, start - line_start + 1))
                 continue
-
-            # Operators / punctuation (longest match handled by branching)
-            if c == "=":
-                if self._match("="):
-                    self._add(TokenKind.EQEQ)
+            pair = eq_suffix(c)
+            if pair is not None:
+                if pos < length and source[pos] == "=":
+                    pos += 1
+                    kind = pair[1]
                 else:
-                    self._add(TokenKind.EQ)
+                    kind = pair[0]
+                append(make(kind, source[start:pos], line, start - line_start + 1))
                 continue
-            if c == "!":
-                if self._match("="):
-                    self._add(TokenKind.NEQ)
-                else:
-                    self._add(TokenKind.BANG)
-                continue
-            if c == ">":
-                if self._match("="):
-                    self._add(TokenKind.GTE)
-                else:
-                    self._add(TokenKind.GT)
-                continue
-            if c == "<":
-                if self._match("="):
-                    self._add(TokenKind.LTE)
-                else:
-                    self._add(TokenKind.LT)
-                continue
-            if c == "&":
-                self._add(TokenKind.AMP)
-                continue
-            if c == "|":
-                self._add(TokenKind.PIPE)
-                continue
-            if c == "+":
-                self._add(TokenKind.PLUS)
-                continue
-            if c == "-":
-                self._add(TokenKind.MINUS)
-                continue
-            if c == "*":
-                self._add(TokenKind.STAR)
-                continue
-            if c == "/":
-                self._add(TokenKind.SLASH)
-                continue
-            if c == "^":
-                self._add(TokenKind.CARET)
-                continue
-            if c == "(":
-                self._add(TokenKind.LPAREN)
-                continue
-            if c == ")":
-                self._add(TokenKind.RPAREN)
-                continue
-            if c == "[":
-                self._add(TokenKind.LBRACKET)
-                continue
-            if c == "]":
-                self._add(TokenKind.RBRACKET)
-                continue
-            if c == ",":
-                self._add(TokenKind.COMMA)
+
+            # Strings
+            if c == '"':
+                self.start, self.pos = start, pos
+                self.line, self._line_start = line, line_start
+                append(make(TokenKind.STRING, *self._string()))
+                pos, line, line_start = self.pos, self.line, self._line_start
                 continue
-            if c == ":":
-                self._add(TokenKind.COLON)
+
+            # Comment (line, starting with #)
+            if c == "#":
+                idx = source.find("\n", pos)
+                pos = length if idx == -1 else idx
                 continue
 
-            raise LexerError(f"Unhandled character '{c}' at {self.line}:{self.col}")
+            col = start - line_start + 1
+            raise LexerError(start, line, col, f"Unhandled character '{c}'")
 
-        self.tokens.append(Token(TokenKind.EOF, "", self.line, self.col))
+        self.pos, self.line, self._line_start = pos, line, line_start
+        eof_col = pos - line_start + 1
+        append(make(TokenKind.EOF, "", line, eof_col))
         return self.tokens
 
-    def _add(self, kind: TokenKind, lexeme: Optional[str] = None) -> None:
-        text = lexeme if lexeme is not None else self.source[self.start : self.pos]
-        self.tokens.append(Token(kind, text, self.line, self.col))
-
-    def _is_at_end(self) -> bool:
-        return self.pos >= self.length
-
-    def _advance(self) -> str:
-        ch = self.source[self.pos]
-        self.pos += 1
-        self.col += 1
-        return ch
-
-    def _peek(self) -> str:
-        if self._is_at_end():
-            return "\0"
-        return self.source[self.pos]
-
-    def _match(self, expected: str) -> bool:
-        if self._is_at_end() or self.source[self.pos] != expected:
-            return False
-        self.pos += 1
-        self.col += 1
-        return True
-
-    def _skip_until_newline(self) -> None:
-        while not self._is_at_end() and self._peek() != "\n":
-            self._advance()
-
-    def _string(self) -> None:
-        # Scan until closing quote, supporting escaped quotes/backslashes.
-        escaped = False
-        while not self._is_at_end():
-            ch = self._advance()
-            if escaped:
-                escaped = False
-                continue
-            if ch == "\\":
-                escaped = True
-                continue
-            if ch == '"':
-                # Include content without surrounding quotes
-                lexeme = self.source[self.start + 1 : self.pos - 1]
-                self._add(TokenKind.STRING, lexeme)
-                return
-            if ch == "\n":
-                self.line += 1
-                self.col = 1
-        raise LexerError(f"Unterminated string at {self.line}:{self.col}")
-
-    def _number(self) -> None:
-        while self._peek().isdigit():
-            self._advance()
-        if self._peek() == "." and self._peek_next().isdigit():
-            self._advance()  # consume '.'
-            while self._peek().isdigit():
-                self._advance()
-        lexeme = self.source[self.start : self.pos]
-        self._add(TokenKind.NUMBER, lexeme)
-
-    def _identifier(self) -> None:
-        while self._peek().isalnum() or self._peek() == "_":
-            self._advance()
-        text = self.source[self.start : self.pos]
-        if text in KEYWORDS:
-            self._add(TokenKind.KEYWORD, text)
-        else:
-            self._add(TokenKind.IDENT, text)
-
-    def _peek_next(self) -> str:
-        if self.pos + 1 >= self.length:
-            return "\0"
-        return self.source[self.pos + 1]
-
-
-__all__ = ["Lexer", "Token", "TokenKind", "LexerError", "KEYWORDS"]
+    def _advance_to(self, end: int) -> None:
+        # Bulk-advance over source[pos:end], keeping line bookkeeping in step.
+        nl = self.source.count("\n", self.pos, end)
+        if nl:
+            self.line += nl
+            self._line_start = self.source.rindex("\n", self.pos, end) + 1
+        self.pos = end
+
+    def _string(self) -> Tuple[str, int, int]:
+        # Two-pointer scan: find the next quote, then any backslash before it;
+        # an escape skips the escaped char and the search resumes after it.
+        source = self.source
+        pos = self.pos
+        while True:
+            quote = source.find('"', pos)
+            if quote == -1:
+                self._advance_to(self.length)
+                col = self.pos - self._line_start + 1
+                raise LexerError(self.pos, self.line, col, "Unterminated string")
+            backslash = source.find("\\", pos, quote)
+            if backslash == -1:
+                break
+            pos = backslash + 2
+        # Position the token at its opening quote, even if the body spans lines.
+        line, col = self.line, self.start - self._line_start + 1
+        self._advance_to(quote + 1)
+        # Include content without surrounding quotes
+        return source[self.start + 1 : quote], line, col
+
+
+__all__ = [
+    "Lexer",
+    "Token",
+    "TokenStream",
+    "TokenTuple",
+    "TokenKind",
+    "LexerError",
+    "KEYWORDS",
+]
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import List
+from typing import Callable, Dict, List, Optional, Tuple
 
 from . import lexer
 from .ast import (
@@ -32,170 +32,287 @@ from .ast import (
     While,
 )
 
+# TokenKind members used by the parse methods, bound once so each use is a
+# single global load.
+_BANG = lexer.TokenKind.BANG
+_CARET = lexer.TokenKind.CARET
+_COLON = lexer.TokenKind.COLON
+_COMMA = lexer.TokenKind.COMMA
+_EOF = lexer.TokenKind.EOF
+_EQ = lexer.TokenKind.EQ
+_IDENT = lexer.TokenKind.IDENT
+_KEYWORD = lexer.TokenKind.KEYWORD
+_LBRACKET = lexer.TokenKind.LBRACKET
+_LPAREN = lexer.TokenKind.LPAREN
+_MINUS = lexer.TokenKind.MINUS
+_NUMBER = lexer.TokenKind.NUMBER
+_PLUS = lexer.TokenKind.PLUS
+_RBRACKET = lexer.TokenKind.RBRACKET
+_RPAREN = lexer.TokenKind.RPAREN
+_STRING = lexer.TokenKind.STRING
+
 
 class ParseError(Exception):
     pass
 
 
+# Arithmetic operator token -> binding power for Parser._expression.
+_POWER_PREC = 3
+_BINARY_PREC = {
+    lexer.TokenKind.PLUS: 1,
+    lexer.TokenKind.MINUS: 1,
+    lexer.TokenKind.STAR: 2,
+    lexer.TokenKind.SLASH: 2,
+    lexer.TokenKind.CARET: _POWER_PREC,
+}
+
+
+# Tokens that can begin an expression (print/return value lists).
+_EXPR_START_KINDS = frozenset(
+    {
+        lexer.TokenKind.NUMBER,
+        lexer.TokenKind.STRING,
+        lexer.TokenKind.IDENT,
+        lexer.TokenKind.LPAREN,
+        lexer.TokenKind.PLUS,
+        lexer.TokenKind.MINUS,
+    }
+)
+_EXPR_START_KEYWORDS = frozenset(
+    {"add", "subtract", "multiply", "divide", "power", "not"}
+)
+
+# Worded binary operators written prefix-style: "add A and B".
+_WORD_BINARY_OPS = frozenset({"add", "subtract", "multiply", "divide"})
+
+# Keywords accepted as a type annotation.
+_TYPE_NAMES = frozenset({"int", "float", "string", "bool", "list", "array"})
+
+# Logical connectives -> binding power for Parser._condition.
+_LOGICAL_KEYWORD_PREC = {"or": 1, "and": 2}
+_LOGICAL_OP_PREC = {lexer.TokenKind.PIPE: 1, lexer.TokenKind.AMP: 2}
+
+# Symbolic comparison operator token -> op.
+_COMPARISON_OPS = {
+    lexer.TokenKind.EQEQ: "==",
+    lexer.TokenKind.NEQ: "!=",
+    lexer.TokenKind.GTE: ">=",
+    lexer.TokenKind.LTE: "<=",
+    lexer.TokenKind.GT: ">",
+    lexer.TokenKind.LT: "<",
+}
+
+# Worded comparison phrases following 'is'.
+_COMPARISON_PHRASES = (
+    (("greater", "than", "or", "equal", "to"), ">="),
+    (("less", "than", "or", "equal", "to"), "<="),
+    (("greater", "or", "equal", "to"), ">="),
+    (("less", "or", "equal", "to"), "<="),
+    (("greater", "than"), ">"),
+    (("less", "than"), "<"),
+    (("equal", "to"), "=="),
+    (("not", "equal", "to"), "!="),
+)
+
+
+def _build_trie(phrases: Tuple[Tuple[Tuple[str, ...], str], ...]) -> dict:
+    # keyword -> subtrie; the None key marks a complete phrase and holds its op.
+    root: dict = {}
+    for words, op in phrases:
+        node = root
+        for word in words:
+            node = node.setdefault(word, {})
+        node[None] = op
+    return root
+
+
+_COMPARISON_TRIE = _build_trie(_COMPARISON_PHRASES)
+
+
 class Parser:
+    _STMT_DISPATCH: Dict[str, Callable[["Parser"], Stmt]]
+
     def __init__(self, tokens: List[lexer.Token]):
-        self.tokens = tokens
-        self.current = 0
+        self.tokens: List[lexer.Token] = tokens
+        self.current: int = 0
+        # Start position -> (end position, node) for bracketed subexpressions,
+        # kept only while a phrase-form assignment may be re-parsed.
+        self._memo: Optional[Dict[int, Tuple[int, Expr]]] = None
 
     def parse(self) -> Program:
+        # Every scan loop relies on the trailing EOF token to stop lookahead.
+        if not len(self.tokens) or self.tokens[-1].kind is not _EOF:
+            raise ParseError("Token stream must end with EOF")
         functions: List[Function] = []
         stmts: List[Stmt] = []
-        while not self._is_at_end():
-            if self._check_kw("function") or self._check_kw("func"):
+        tokens = self.tokens
+        statement = self._statement
+        while True:
+            t = tokens[self.current]
+            if t.kind is _EOF:
+                break
+            if t.kind is _KEYWORD and t.lexeme in ("function", "func"):
                 functions.append(self._function_def())
                 continue
-            stmts.append(self._statement())
-        first_node = None
-        if functions:
-            first_node = functions[0]
-        if stmts:
-            first_node = first_node or stmts[0]
-        first_line = getattr(first_node, "line", None) if first_node else None
-        first_col = getattr(first_node, "col", None) if first_node else None
+            stmts.append(statement())
+        first_node = functions[0] if functions else stmts[0] if stmts else None
+        if first_node is None:
+            return Program(functions=functions, statements=stmts)
         return Program(
-            functions=functions, statements=stmts, line=first_line, col=first_col
+            functions=functions,
+            statements=stmts,
+            line=first_node.line,
+            col=first_node.col,
         )
 
     # --- statements ---
     def _statement(self) -> Stmt:
-        if self._match_kw("add"):
-            return self._inplace_update("add")
-        if self._match_kw("sub") or self._match_kw("subtract"):
-            return self._inplace_update("sub")
-        if self._match_kw("make"):
-            name_tok = self._consume_ident("Expected identifier after 'make'")
-            typ = None
-            size_expr = None
-            if self._match_kw("as"):
-                typ = self._type_name()
-                if typ in {"list", "array"} and self._match_kw("of"):
-                    self._consume_kw("size", "Expected 'size' after 'of'")
-                    size_expr = self._expression()
-            return Declaration(
-                name=name_tok.lexeme,
-                type=typ,
-                size=size_expr,
-                line=name_tok.line,
-                col=name_tok.col,
-            )
-        if self._match_kw("call"):
-            return self._call_statement()
-        if self._match_kw("return"):
-            return self._return_statement()
-        if self._match_kw("input"):
-            prompt = None
-            if self._check_kind(lexer.TokenKind.STRING):
-                prompt_tok = self._advance()
-                prompt = prompt_tok.lexeme
-            name_tok = self._consume_ident("Expected identifier after 'input'")
-            typ = None
-            if self._match_kw("as"):
-                typ = self._type_name()
-            return Input(
-                name=name_tok.lexeme,
-                type=typ,
-                prompt=prompt,
-                line=name_tok.line,
-                col=name_tok.col,
-            )
-        if self._match_kw("set"):
-            if self._check_kw("return"):
-                ret_kw = self._advance()
-                self._consume_kw("to", "Expected 'to' after 'set return'")
-                return self._return_statement(ret_kw)
-            name_tok = self._consume_ident("Expected identifier after 'set'")
-            idx_expr = None
-            if self._match_op(lexer.TokenKind.LBRACKET):
-                idx_expr = self._expression()
-                self._consume(lexer.TokenKind.RBRACKET, "Expected ']' after index")
-            var_type = None
-            if idx_expr is None and self._match_op(lexer.TokenKind.COLON):
-                var_type = self._type_name()
-            self._consume_kw("to", "Expected 'to' in assignment")
-            expr = self._assignment_rhs(name_tok)
-            if idx_expr is not None:
-                return IndexAssign(
-                    name=name_tok.lexeme,
-                    index=idx_expr,
-                    expr=expr,
-                    line=name_tok.line,
-                    col=name_tok.col,
-                )
-            return Assign(
+        # One lookup on the leading keyword picks the production; handlers run
+        # with the keyword already consumed.
+        tok = self.tokens[self.current]
+        if tok.kind is _KEYWORD:
+            handler = self._STMT_DISPATCH.get(tok.lexeme)
+            if handler is not None:
+                self.current += 1
+                return handler(self)
+        raise ParseError(f"Unexpected token {tok.lexeme} at {tok.line}:{tok.col}")
+
+    def _add_statement(self) -> Assign:
+        return self._inplace_update("add")
+
+    def _sub_statement(self) -> Assign:
+        return self._inplace_update("sub")
+
+    def _make_statement(self) -> Declaration:
+        name_tok = self._consume_ident("Expected identifier after 'make'")
+        typ = None
+        size_expr = None
+        if self._match_kw("as"):
+            typ = self._type_name()
+            if typ in {"list", "array"} and self._match_kw("of"):
+                self._consume_kw("size", "Expected 'size' after 'of'")
+                size_expr = self._expression()
+        return Declaration(
+            name=name_tok.lexeme,
+            type=typ,
+            size=size_expr,
+            line=name_tok.line,
+            col=name_tok.col,
+        )
+
+    def _input_statement(self) -> Input:
+        prompt = None
+        if self._check_kind(_STRING):
+            prompt_tok = self._advance()
+            prompt = prompt_tok.lexeme
+        name_tok = self._consume_ident("Expected identifier after 'input'")
+        typ = None
+        if self._match_kw("as"):
+            typ = self._type_name()
+        return Input(
+            name=name_tok.lexeme,
+            type=typ,
+            prompt=prompt,
+            line=name_tok.line,
+            col=name_tok.col,
+        )
+
+    def _set_statement(self) -> Stmt:
+        if self._check_kw("return"):
+            ret_kw = self._advance()
+            self._consume_kw("to", "Expected 'to' after 'set return'")
+            return self._return_statement(ret_kw)
+        name_tok = self._consume_ident("Expected identifier after 'set'")
+        idx_expr = None
+        if self._match_op(_LBRACKET):
+            idx_expr = self._expression()
+            self._consume(_RBRACKET, "Expected ']' after index")
+        var_type = None
+        if idx_expr is None and self._match_op(_COLON):
+            var_type = self._type_name()
+        self._consume_kw("to", "Expected 'to' in assignment")
+        expr = self._assignment_rhs(name_tok)
+        if idx_expr is not None:
+            return IndexAssign(
                 name=name_tok.lexeme,
+                index=idx_expr,
                 expr=expr,
-                type=var_type,
                 line=name_tok.line,
                 col=name_tok.col,
             )
-        if self._match_kw("print"):
-            first_expr = self._expression()
-            values = [first_expr]
-            while True:
-                if self._match_op(lexer.TokenKind.COMMA):
-                    values.append(self._expression())
-                    continue
-                if self._is_expr_start():
-                    values.append(self._expression())
-                    continue
-                break
-            first_line = getattr(first_expr, "line", None)
-            first_col = getattr(first_expr, "col", None)
-            return Print(values=values, line=first_line, col=first_col)
-        if self._match_kw("if"):
-            return self._if_statement()
-        if self._match_kw("while"):
-            cond = self._condition()
-            self._consume_kw("do", "Expected 'do' after while condition")
-            body = self._block_until_end("while")
-            return While(cond=cond, body=body, line=cond.line, col=cond.col)
-        if self._match_kw("for"):
-            var_tok = self._consume_ident("Expected loop variable after 'for'")
-            self._consume_kw("from", "Expected 'from' in for loop")
-            start = self._expression()
-            self._consume_kw("to", "Expected 'to' in for loop")
-            end = self._expression()
-            self._consume_kw("do", "Expected 'do' after for header")
-            body = self._block_until_end("for")
-            return For(
-                var=var_tok.lexeme,
-                start=start,
-                end=end,
-                body=body,
-                line=var_tok.line,
-                col=var_tok.col,
-            )
-        tok = self._peek()
-        raise ParseError(f"Unexpected token {tok.lexeme} at {tok.line}:{tok.col}")
+        return Assign(
+            name=name_tok.lexeme,
+            expr=expr,
+            type=var_type,
+            line=name_tok.line,
+            col=name_tok.col,
+        )
+
+    def _print_statement(self) -> Print:
+        first_expr = self._expression()
+        values: List[Expr] = [first_expr]
+        self._more_values(values)
+        return Print(values=values, line=first_expr.line, col=first_expr.col)
+
+    def _while_statement(self) -> While:
+        cond = self._condition()
+        self._consume_kw("do", "Expected 'do' after while condition")
+        body = self._block_until_end("while")
+        return While(cond=cond, body=body, line=cond.line, col=cond.col)
+
+    def _for_statement(self) -> For:
+        var_tok = self._consume_ident("Expected loop variable after 'for'")
+        self._consume_kw("from", "Expected 'from' in for loop")
+        start = self._expression()
+        self._consume_kw("to", "Expected 'to' in for loop")
+        end = self._expression()
+        self._consume_kw("do", "Expected 'do' after for header")
+        body = self._block_until_end("for")
+        return For(
+            var=var_tok.lexeme,
+            start=start,
+            end=end,
+            body=body,
+            line=var_tok.line,
+            col=var_tok.col,
+        )
 
     def _function_def(self) -> Function:
         start_kw = "function" if self._match_kw("function") else "func"
         name_tok = self._consume_function_name()
         # Support both legacy "arguments:" and simplified signature directly.
         if self._match_kw("arguments") or self._match_kw("aguments"):
-            self._match_op(lexer.TokenKind.COLON)
-        self._consume(lexer.TokenKind.LPAREN, "Expected '(' after function name")
+            self._match_op(_COLON)
+        self._consume(_LPAREN, "Expected '(' after function name")
         params: List[Param] = []
-        if not self._check_kind(lexer.TokenKind.RPAREN):
+        tokens = self.tokens
+        if not self._check_kind(_RPAREN):
+            param_decl = self._param_decl
             while True:
-                params.append(self._param_decl())
-                if self._match_op(lexer.TokenKind.COMMA):
-                    continue
-                break
-        self._consume(lexer.TokenKind.RPAREN, "Expected ')' after parameters")
+                params.append(param_decl())
+                if tokens[self.current].kind is not _COMMA:
+                    break
+                self.current += 1
+        self._consume(_RPAREN, "Expected ')' after parameters")
 
         body: List[Stmt] = []
-        while not self._is_at_end():
-            if self._check_kw("end_function") or self._check_kw("end_func"):
-                break
-            if self._check_kw("end") and self._next_kw_in({"function", "func"}):
+        statement = self._statement
+        append = body.append
+        while True:
+            t = tokens[self.current]
+            if t.kind is _EOF:
                 break
-            body.append(self._statement())
+            if t.kind is _KEYWORD:
+                if t.lexeme in ("end_function", "end_func"):
+                    break
+                if t.lexeme == "end":
+                    nxt = tokens[self.current + 1]
+                    if nxt.kind is _KEYWORD and nxt.lexeme in (
+                        "function",
+                        "func",
+                    ):
+                        break
+            append(statement())
 
         if self._match_kw("end_function") or self._match_kw("end_func"):
             pass
@@ -222,9 +339,9 @@ class Parser:
         name_tok = self._consume_ident("Expected parameter name")
         param_type = None
         default = None
-        if self._match_op(lexer.TokenKind.COLON):
+        if self._match_op(_COLON):
             param_type = self._type_name()
-        if self._match_op(lexer.TokenKind.EQ):
+        if self._match_op(_EQ):
             default = self._expression()
         return Param(
             name=name_tok.lexeme,
@@ -240,17 +357,17 @@ class Parser:
         self._consume_any_kw(
             ["arguments", "aguments"], "Expected 'arguments' after 'with'"
         )
-        self._match_op(lexer.TokenKind.COLON)
-        self._consume(lexer.TokenKind.LPAREN, "Expected '(' after arguments:")
+        self._match_op(_COLON)
+        self._consume(_LPAREN, "Expected '(' after arguments:")
         args: List[Arg] = []
-        if not self._check_kind(lexer.TokenKind.RPAREN):
+        if not self._check_kind(_RPAREN):
+            tokens = self.tokens
+            expression = self._expression
             while True:
-                if self._check_kind(lexer.TokenKind.IDENT) and self._peek_next_is(
-                    lexer.TokenKind.EQ
-                ):
-                    arg_name_tok = self._advance()
-                    self._consume(lexer.TokenKind.EQ, "Expected '=' after arg name")
-                    value = self._expression()
+                arg_name_tok = tokens[self.current]
+                if arg_name_tok.kind is _IDENT and tokens[self.current + 1].kind is _EQ:
+                    self.current += 2  # name and '='
+                    value = expression()
                     args.append(
                         Arg(
                             name=arg_name_tok.lexeme,
@@ -260,15 +377,15 @@ class Parser:
                         )
                     )
                 else:
-                    value = self._expression()
+                    value = expression()
                     args.append(
                         Arg(name=None, value=value, line=value.line, col=value.col)
                     )
 
-                if self._match_op(lexer.TokenKind.COMMA):
-                    continue
-                break
-        self._consume(lexer.TokenKind.RPAREN, "Expected ')' after call arguments")
+                if tokens[self.current].kind is not _COMMA:
+                    break
+                self.current += 1
+        self._consume(_RPAREN, "Expected ')' after call arguments")
         return Call(
             name=name_tok.lexeme, args=args, line=name_tok.line, col=name_tok.col
         )
@@ -283,20 +400,16 @@ class Parser:
 
         elifs: List[IfBranch] = []
         else_body = None
-        while self._match_kw("else") and self._match_kw("if"):
+        while self._match_kw("else"):
+            if not self._match_kw("if"):
+                # A bare 'else' ends the chain; its body runs to 'end if'.
+                else_body = self._block_until_end_if()
+                break
             cond = self._condition()
             self._consume_kw("then", "Expected 'then' after else if condition")
             body = self._block_until_else_or_end()
             elifs.append(IfBranch(cond=cond, body=body, line=cond.line, col=cond.col))
 
-        if self._previous_two_keywords_were_else_if():
-            pass
-        elif self._previous_is_kw("else"):
-            else_body = self._block_until_end_if()
-
-        if else_body is None and self._match_kw("else"):
-            else_body = self._block_until_end_if()
-
         self._consume_pair_end("if")
         return If(
             first=first_branch,
@@ -307,205 +420,203 @@ class Parser:
         )
 
     def _block_until_else_or_end(self) -> List[Stmt]:
-        stmts: List[Stmt] = []
-        while not self._is_at_end():
-            if self._check_kw("else") or self._check_pair_end("if"):
-                break
-            stmts.append(self._statement())
-        return stmts
+        return self._statements_until_end("if", stop_at_else=True)
 
     def _block_until_end_if(self) -> List[Stmt]:
-        stmts: List[Stmt] = []
-        while not self._is_at_end():
-            if self._check_pair_end("if"):
-                break
-            stmts.append(self._statement())
-        return stmts
+        return self._statements_until_end("if")
 
     def _block_until_end(self, kind: str) -> List[Stmt]:
+        stmts = self._statements_until_end(kind)
+        self._consume_pair_end(kind)
+        return stmts
+
+    def _statements_until_end(
+        self, kind: str, stop_at_else: bool = False
+    ) -> List[Stmt]:
+        # Statements up to (not including) 'end <kind>', a bare 'else' when
+        # stop_at_else is set, or EOF. The pair check is inlined on the
+        # current token; a non-EOF token always has a successor.
         stmts: List[Stmt] = []
-        while not self._is_at_end():
-            if self._check_pair_end(kind):
+        tokens = self.tokens
+        statement = self._statement
+        append = stmts.append
+        while True:
+            t = tokens[self.current]
+            if t.kind is _KEYWORD:
+                if t.lexeme == "end":
+                    nxt = tokens[self.current + 1]
+                    if nxt.kind is _KEYWORD and nxt.lexeme == kind:
+                        break
+                elif stop_at_else and t.lexeme == "else":
+                    break
+            elif t.kind is _EOF:
                 break
-            stmts.append(self._statement())
-        self._consume_pair_end(kind)
+            append(statement())
         return stmts
 
     # --- conditions ---
-    def _condition(self) -> Expr:
-        return self._cond_or()
-
-    def _cond_or(self) -> Expr:
-        expr = self._cond_and()
-        while self._match_kw("or") or self._match_op(lexer.TokenKind.PIPE):
-            op_tok = self._previous()
-            right = self._cond_and()
-            expr = Binary(expr, op_tok.lexeme, right, line=op_tok.line, col=op_tok.col)
-        return expr
-
-    def _cond_and(self) -> Expr:
+    def _condition(self, min_prec: int = 1) -> Expr:
+        # Precedence climbing over 'or'/'|' (1) and 'and'/'&' (2), both
+        # left-associative; operands are _cond_not.
         expr = self._cond_not()
-        while self._match_kw("and") or self._match_op(lexer.TokenKind.AMP):
-            op_tok = self._previous()
-            right = self._cond_not()
-            expr = Binary(expr, op_tok.lexeme, right, line=op_tok.line, col=op_tok.col)
-        return expr
+        tokens = self.tokens
+        while True:
+            op_tok = tokens[self.current]
+            if op_tok.kind is _KEYWORD:
+                prec = _LOGICAL_KEYWORD_PREC.get(op_tok.lexeme)
+            else:
+                prec = _LOGICAL_OP_PREC.get(op_tok.kind)
+            if prec is None or prec < min_prec:
+                return expr
+            self.current += 1
+            right = self._condition(prec + 1)
+            expr = Binary(expr, op_tok.lexeme, right, op_tok.line, op_tok.col)
 
     def _cond_not(self) -> Expr:
-        if self._match_kw("not") or self._match_op(lexer.TokenKind.BANG):
-            op_tok = self._previous()
-            right = self._cond_not()
-            return Unary(op_tok.lexeme, right, line=op_tok.line, col=op_tok.col)
-        return self._cond_cmp()
+        # Collect a run of 'not'/'!' prefixes in a loop, then wrap the operand
+        # innermost-first, instead of recursing once per negation.
+        tokens = self.tokens
+        negations: List[lexer.Token] = []
+        i = self.current
+        while True:
+            t = tokens[i]
+            if t.kind is _BANG or (t.kind is _KEYWORD and t.lexeme == "not"):
+                negations.append(t)
+                i += 1
+            else:
+                break
+        self.current = i
+        expr = self._cond_cmp()
+        for op_tok in reversed(negations):
+            expr = Unary(op_tok.lexeme, expr, op_tok.line, op_tok.col)
+        return expr
 
     def _cond_cmp(self) -> Expr:
-        if self._match_op(lexer.TokenKind.LPAREN):
+        if self._match_op(_LPAREN):
             expr = self._condition()
-            self._consume(lexer.TokenKind.RPAREN, "Expected ')' after condition")
+            self._consume(_RPAREN, "Expected ')' after condition")
             return expr
         left = self._expression()
         op = self._comparison_op()
         right = self._expression()
-        return Binary(left, op, right, line=left.line, col=left.col)
+        return Binary(left, op, right, left.line, left.col)
 
     def _comparison_op(self) -> str:
-        if self._match_op(lexer.TokenKind.EQEQ):
-            return "=="
-        if self._match_op(lexer.TokenKind.NEQ):
-            return "!="
-        if self._match_op(lexer.TokenKind.GTE):
-            return ">="
-        if self._match_op(lexer.TokenKind.LTE):
-            return "<="
-        if self._match_op(lexer.TokenKind.GT):
-            return ">"
-        if self._match_op(lexer.TokenKind.LT):
-            return "<"
+        op = _COMPARISON_OPS.get(self.tokens[self.current].kind)
+        if op is not None:
+            self.current += 1
+            return op
         if self._match_kw("is"):
-            seqs = [
-                (["greater", "than", "or", "equal", "to"], ">="),
-                (["less", "than", "or", "equal", "to"], "<="),
-                (["greater", "or", "equal", "to"], ">="),
-                (["less", "or", "equal", "to"], "<="),
-                (["greater", "than"], ">"),
-                (["less", "than"], "<"),
-                (["equal", "to"], "=="),
-                (["not", "equal", "to"], "!="),
-            ]
-            for seq, op in seqs:
-                if self._try_keywords(seq):
-                    return op
+            # Walk the phrase trie as far as the keywords go and take the
+            # longest complete phrase seen on the way.
+            tokens = self.tokens
+            node = _COMPARISON_TRIE
+            i = end = self.current
+            op = None
+            while True:
+                t = tokens[i]
+                if t.kind is not _KEYWORD:
+                    break
+                node = node.get(t.lexeme)
+                if node is None:
+                    break
+                i += 1
+                if None in node:
+                    op, end = node[None], i
+            if op is not None:
+                self.current = end
+                return op
         tok = self._peek()
         raise ParseError(f"Expected comparison operator at {tok.line}:{tok.col}")
 
     # --- expressions ---
-    def _expression(self) -> Expr:
-        return self._add_expr()
-
-    def _add_expr(self) -> Expr:
-        expr = self._mul_expr()
-        while True:
-            if self._match_op(lexer.TokenKind.PLUS):
-                op_tok = self._previous()
-                right = self._mul_expr()
-                expr = Binary(
-                    expr, op_tok.lexeme, right, line=op_tok.line, col=op_tok.col
-                )
-            elif self._match_op(lexer.TokenKind.MINUS):
-                op_tok = self._previous()
-                right = self._mul_expr()
-                expr = Binary(
-                    expr, op_tok.lexeme, right, line=op_tok.line, col=op_tok.col
-                )
-            else:
-                break
-        return expr
-
-    def _mul_expr(self) -> Expr:
-        expr = self._power_expr()
+    def _expression(self, min_prec: int = 1) -> Expr:
+        # Precedence climbing over the arithmetic operators: one loop per
+        # operand instead of a frame per precedence level. '^' binds tightest,
+        # is right-associative and builds Power nodes.
+        expr = self._unary_expr()
+        tokens = self.tokens
         while True:
-            if self._match_op(lexer.TokenKind.STAR):
-                op_tok = self._previous()
-                right = self._power_expr()
-                expr = Binary(
-                    expr, op_tok.lexeme, right, line=op_tok.line, col=op_tok.col
-                )
-            elif self._match_op(lexer.TokenKind.SLASH):
-                op_tok = self._previous()
-                right = self._power_expr()
-                expr = Binary(
-                    expr, op_tok.lexeme, right, line=op_tok.line, col=op_tok.col
-                )
+            op_tok = tokens[self.current]
+            prec = _BINARY_PREC.get(op_tok.kind)
+            if prec is None or prec < min_prec:
+                return expr
+            self.current += 1
+            if prec == _POWER_PREC:
+                expr = self._power_chain(expr, op_tok)
             else:
-                break
+                right = self._expression(prec + 1)
+                expr = Binary(expr, op_tok.lexeme, right, op_tok.line, op_tok.col)
+
+    def _power_chain(self, base: Expr, caret: lexer.Token) -> Expr:
+        # base ^ a ^ b ...: gather the operands in one loop, then fold from the
+        # right so '^' stays right-associative without a frame per operator.
+        tokens = self.tokens
+        operands: List[Expr] = [base, self._unary_expr()]
+        carets: List[lexer.Token] = [caret]
+        while tokens[self.current].kind is _CARET:
+            carets.append(tokens[self.current])
+            self.current += 1
+            operands.append(self._unary_expr())
+        expr = operands.pop()
+        while carets:
+            caret = carets.pop()
+            expr = Power(operands.pop(), expr, caret.line, caret.col)
         return expr
 
-    def _power_expr(self) -> Expr:
-        base = self._unary_expr()
-        if self._match_op(lexer.TokenKind.CARET):
-            op_tok = self._previous()
-            exponent = self._power_expr()
-            return Power(base=base, exponent=exponent, line=op_tok.line, col=op_tok.col)
-        return base
-
     def _unary_expr(self) -> Expr:
-        if self._match_op(lexer.TokenKind.PLUS):
-            op_tok = self._previous()
-            return Unary("+", self._unary_expr(), line=op_tok.line, col=op_tok.col)
-        if self._match_op(lexer.TokenKind.MINUS):
-            op_tok = self._previous()
-            return Unary("-", self._unary_expr(), line=op_tok.line, col=op_tok.col)
+        op_tok = self.tokens[self.current]
+        if op_tok.kind is _PLUS or op_tok.kind is _MINUS:
+            self.current += 1
+            right = self._unary_expr()
+            if type(right) is Number:
+                # Fold the sign into a numeric literal instead of wrapping it.
+                value = right.value
+                if op_tok.kind is _MINUS:
+                    value = value[1:] if value[0] == "-" else "-" + value
+                return Number(value, right.is_float, op_tok.line, op_tok.col)
+            return Unary(op_tok.lexeme, right, op_tok.line, op_tok.col)
         return self._primary()
 
     def _primary(self) -> Expr:
-        if self._match_kw("add"):
-            op_tok = self._previous()
-            left = self._unary_expr()
-            self._consume_kw("and", "Expected 'and' after left operand")
-            right = self._unary_expr()
-            return Binary(left, "add", right, line=op_tok.line, col=op_tok.col)
-        if self._match_kw("subtract"):
-            op_tok = self._previous()
-            left = self._unary_expr()
-            self._consume_kw("and", "Expected 'and' after left operand")
-            right = self._unary_expr()
-            return Binary(left, "subtract", right, line=op_tok.line, col=op_tok.col)
-        if self._match_kw("multiply"):
-            op_tok = self._previous()
-            left = self._unary_expr()
-            self._consume_kw("and", "Expected 'and' after left operand")
-            right = self._unary_expr()
-            return Binary(left, "multiply", right, line=op_tok.line, col=op_tok.col)
-        if self._match_kw("divide"):
-            op_tok = self._previous()
-            left = self._unary_expr()
-            self._consume_kw("and", "Expected 'and' after left operand")
-            right = self._unary_expr()
-            return Binary(left, "divide", right, line=op_tok.line, col=op_tok.col)
-        if self._match_kw("power"):
-            op_tok = self._previous()
-            base = self._unary_expr()
-            self._consume_kw("and", "Expected 'and' after base")
-            exponent = self._unary_expr()
-            return Power(base=base, exponent=exponent, line=op_tok.line, col=op_tok.col)
-        if self._match_kind(lexer.TokenKind.NUMBER):
-            tok = self._previous()
-            return Number(tok.lexeme, line=tok.line, col=tok.col)
-        if self._match_kind(lexer.TokenKind.STRING):
-            tok = self._previous()
-            return String(tok.lexeme, line=tok.line, col=tok.col)
-        if self._match_kind(lexer.TokenKind.IDENT):
-            tok = self._previous()
-            if self._match_op(lexer.TokenKind.LBRACKET):
-                idx = self._expression()
-                self._consume(lexer.TokenKind.RBRACKET, "Expected ']' after index")
-                return Index(tok.lexeme, idx, line=tok.line, col=tok.col)
-            return Var(tok.lexeme, line=tok.line, col=tok.col)
-        if self._match_op(lexer.TokenKind.LPAREN):
-            expr = self._expression()
-            self._consume(lexer.TokenKind.RPAREN, "Expected ')' after expression")
+        # Read the leading token once: literal/name kinds first, since they are
+        # the common leaves, then the worded prefix operators.
+        tok = self.tokens[self.current]
+        kind = tok.kind
+        if kind is _IDENT:
+            self.current += 1
+            if self.tokens[self.current].kind is _LBRACKET:
+                self.current += 1
+                idx = self._subexpression()
+                self._consume(_RBRACKET, "Expected ']' after index")
+                return Index(tok.lexeme, idx, tok.line, tok.col)
+            return Var(tok.lexeme, tok.line, tok.col)
+        if kind is _NUMBER:
+            self.current += 1
+            lexeme = tok.lexeme
+            return Number(lexeme, "." in lexeme, tok.line, tok.col)
+        if kind is _STRING:
+            self.current += 1
+            return String(tok.lexeme, tok.line, tok.col)
+        if kind is _LPAREN:
+            self.current += 1
+            expr = self._subexpression()
+            self._consume(_RPAREN, "Expected ')' after expression")
             return expr
-        tok = self._peek()
+        if kind is _KEYWORD:
+            op = tok.lexeme
+            if op in _WORD_BINARY_OPS:
+                self.current += 1
+                left = self._unary_expr()
+                self._consume_kw("and", "Expected 'and' after left operand")
+                right = self._unary_expr()
+                return Binary(left, op, right, tok.line, tok.col)
+            if op == "power":
+                self.current += 1
+                base = self._unary_expr()
+                self._consume_kw("and", "Expected 'and' after base")
+                exponent = self._unary_expr()
+                return Power(base, exponent, tok.line, tok.col)
         raise ParseError(f"Expected expression at {tok.line}:{tok.col}")
 
     def _inplace_update(self, kind: str) -> Assign:
@@ -514,25 +625,21 @@ class Parser:
             self._consume_kw("to", "Expected 'to' after add expression")
             target_tok = self._consume_ident("Expected target variable after 'to'")
             expr = Binary(
-                left=Var(
-                    name=target_tok.lexeme, line=target_tok.line, col=target_tok.col
-                ),
-                op="+",
-                right=value,
-                line=target_tok.line,
-                col=target_tok.col,
+                Var(target_tok.lexeme, target_tok.line, target_tok.col),
+                "+",
+                value,
+                target_tok.line,
+                target_tok.col,
             )
         else:
             self._consume_kw("from", "Expected 'from' after sub expression")
             target_tok = self._consume_ident("Expected target variable after 'from'")
             expr = Binary(
-                left=Var(
-                    name=target_tok.lexeme, line=target_tok.line, col=target_tok.col
-                ),
-                op="-",
-                right=value,
-                line=target_tok.line,
-                col=target_tok.col,
+                Var(target_tok.lexeme, target_tok.line, target_tok.col),
+                "-",
+                value,
+                target_tok.line,
+                target_tok.col,
             )
         return Assign(
             name=target_tok.lexeme,
@@ -541,7 +648,33 @@ class Parser:
             col=target_tok.col,
         )
 
+    def _subexpression(self) -> Expr:
+        memo = self._memo
+        if memo is None:
+            return self._expression()
+        start = self.current
+        hit = memo.get(start)
+        if hit is not None:
+            self.current = hit[0]
+            return hit[1]
+        expr = self._expression()
+        memo[start] = (self.current, expr)
+        return expr
+
     def _assignment_rhs(self, lhs_tok: lexer.Token) -> Expr:
+        if not (
+            self._check_kw("add") or self._check_kw("sub") or self._check_kw("subtract")
+        ):
+            return self._expression()
+        # A phrase attempt that finds no 'to'/'from' is re-parsed as a plain
+        # expression; memoize so the second pass reuses bracketed operands.
+        self._memo = {}
+        try:
+            return self._assignment_phrase(lhs_tok)
+        finally:
+            self._memo = None
+
+    def _assignment_phrase(self, lhs_tok: lexer.Token) -> Expr:
         # Support phrase forms like "add 6 to x" / "sub 2 from x" while
         # leaving regular expressions like "add 1 and 2" untouched.
         if self._check_kw("add"):
@@ -551,15 +684,11 @@ class Parser:
             if self._match_kw("to"):
                 target_tok = self._consume_ident("Expected target variable after 'to'")
                 return Binary(
-                    left=Var(
-                        name=target_tok.lexeme,
-                        line=target_tok.line,
-                        col=target_tok.col,
-                    ),
-                    op="+",
-                    right=value,
-                    line=lhs_tok.line,
-                    col=lhs_tok.col,
+                    Var(target_tok.lexeme, target_tok.line, target_tok.col),
+                    "+",
+                    value,
+                    lhs_tok.line,
+                    lhs_tok.col,
                 )
             self.current = save
         if self._check_kw("sub") or self._check_kw("subtract"):
@@ -571,15 +700,11 @@ class Parser:
                     "Expected target variable after 'from'"
                 )
                 return Binary(
-                    left=Var(
-                        name=target_tok.lexeme,
-                        line=target_tok.line,
-                        col=target_tok.col,
-                    ),
-                    op="-",
-                    right=value,
-                    line=lhs_tok.line,
-                    col=lhs_tok.col,
+                    Var(target_tok.lexeme, target_tok.line, target_tok.col),
+                    "-",
+                    value,
+                    lhs_tok.line,
+                    lhs_tok.col,
                 )
             self.current = save
         return self._expression()
@@ -587,164 +712,115 @@ class Parser:
     def _return_statement(self, start_tok: lexer.Token | None = None) -> Return:
         values: List[Expr] = []
         if self._is_expr_start():
-            first = self._expression()
-            values.append(first)
-            while True:
-                if self._match_op(lexer.TokenKind.COMMA):
-                    values.append(self._expression())
-                    continue
-                if self._is_expr_start():
-                    values.append(self._expression())
-                    continue
-                break
+            values.append(self._expression())
+            self._more_values(values)
         tok = start_tok or self._previous()
         return Return(values=values, line=tok.line, col=tok.col)
 
+    def _more_values(self, values: List[Expr]) -> None:
+        # Values after the first in a print/return list, each optionally
+        # preceded by a comma; the current token is read once per step.
+        tokens = self.tokens
+        while True:
+            t = tokens[self.current]
+            if t.kind is _COMMA:
+                self.current += 1
+            elif not (
+                t.kind in _EXPR_START_KINDS
+                or (t.kind is _KEYWORD and t.lexeme in _EXPR_START_KEYWORDS)
+            ):
+                return
+            values.append(self._expression())
+
     # --- helpers ---
+    # Each helper reads the token list directly rather than going through
+    # _peek, keeping the per-token check to a single call. The stream always
+    # ends with EOF, which never matches a keyword or the kinds passed in
+    # here, so no separate end check is needed.
     def _match_kw(self, kw: str) -> bool:
-        if self._check_kw(kw):
-            self._advance()
+        t = self.tokens[self.current]
+        if t.kind is _KEYWORD and t.lexeme == kw:
+            self.current += 1
             return True
         return False
 
     def _match_op(self, kind: lexer.TokenKind) -> bool:
-        if self._check_kind(kind):
-            self._advance()
-            return True
-        return False
-
-    def _match_kind(self, kind: lexer.TokenKind) -> bool:
-        if self._check_kind(kind):
-            self._advance()
+        if self.tokens[self.current].kind is kind:
+            self.current += 1
             return True
         return False
 
-    def _consume_kw(self, kw: str, msg: str):
-        if self._match_kw(kw):
+    def _consume_kw(self, kw: str, msg: str) -> None:
+        t = self.tokens[self.current]
+        if t.kind is _KEYWORD and t.lexeme == kw:
+            self.current += 1
             return
         raise ParseError(msg)
 
     def _type_name(self) -> str:
-        for t in ("int", "float", "string", "bool", "list", "array"):
-            if self._match_kw(t):
-                return t
-        tok = self._peek()
-        raise ParseError(f"Expected type at {tok.line}:{tok.col}")
+        t = self.tokens[self.current]
+        if t.kind is _KEYWORD and t.lexeme in _TYPE_NAMES:
+            self.current += 1
+            return t.lexeme
+        raise ParseError(f"Expected type at {t.line}:{t.col}")
 
-    def _consume(self, kind: lexer.TokenKind, msg: str):
-        if self._check_kind(kind):
-            self._advance()
+    def _consume(self, kind: lexer.TokenKind, msg: str) -> None:
+        if self.tokens[self.current].kind is kind:
+            self.current += 1
             return
         raise ParseError(msg)
 
-    def _consume_ident(self, msg: str):
-        if self._check_kind(lexer.TokenKind.IDENT):
-            return self._advance()
+    def _consume_ident(self, msg: str) -> lexer.Token:
+        t = self.tokens[self.current]
+        if t.kind is _IDENT:
+            self.current += 1
+            return t
         raise ParseError(msg)
 
     def _check_kw(self, kw: str) -> bool:
-        if self._is_at_end():
-            return False
-        t = self._peek()
-        return t.kind == lexer.TokenKind.KEYWORD and t.lexeme == kw
-
-    def _consume_function_name(self):
-        if self._check_kind(lexer.TokenKind.STRING):
-            return self._advance()
-        if self._check_kind(lexer.TokenKind.IDENT):
-            return self._advance()
+        t = self.tokens[self.current]
+        return t.kind is _KEYWORD and t.lexeme == kw
+
+    def _consume_function_name(self) -> lexer.Token:
+        t = self.tokens[self.current]
+        if t.kind is _STRING or t.kind is _IDENT:
+            self.current += 1
+            return t
         raise ParseError("Expected function name")
 
-    def _consume_any_kw(self, kws: List[str], msg: str):
+    def _consume_any_kw(self, kws: List[str], msg: str) -> None:
         for kw in kws:
             if self._match_kw(kw):
                 return
         raise ParseError(msg)
 
-    def _peek_next_is(self, kind: lexer.TokenKind) -> bool:
-        if self.current + 1 >= len(self.tokens):
-            return False
-        return self.tokens[self.current + 1].kind == kind
-
-    def _next_kw_in(self, kws: set[str]) -> bool:
-        if self.current + 1 >= len(self.tokens):
-            return False
-        nxt = self.tokens[self.current + 1]
-        return nxt.kind == lexer.TokenKind.KEYWORD and nxt.lexeme in kws
-
     def _check_kind(self, kind: lexer.TokenKind) -> bool:
-        if self._is_at_end():
-            return False
-        return self._peek().kind == kind
+        return self.tokens[self.current].kind is kind
 
     def _is_expr_start(self) -> bool:
-        if self._is_at_end():
-            return False
-        t = self._peek()
-        if t.kind in {
-            lexer.TokenKind.NUMBER,
-            lexer.TokenKind.STRING,
-            lexer.TokenKind.IDENT,
-            lexer.TokenKind.LPAREN,
-            lexer.TokenKind.PLUS,
-            lexer.TokenKind.MINUS,
-        }:
-            return True
-        if t.kind == lexer.TokenKind.KEYWORD and t.lexeme in {
-            "add",
-            "subtract",
-            "multiply",
-            "divide",
-            "power",
-            "not",
-        }:
-            return True
-        return False
-
-    def _check_pair_end(self, kind: str | None = None) -> bool:
-        if not self._check_kw("end"):
-            return False
-        if kind is None:
-            return True
-        if self.current + 1 >= len(self.tokens):
-            return False
-        nxt = self.tokens[self.current + 1]
-        return nxt.kind == lexer.TokenKind.KEYWORD and nxt.lexeme == kind
-
-    def _consume_pair_end(self, kind: str):
-        self._consume_kw("end", f"Expected 'end' to close {kind}")
-        self._consume_kw(kind, f"Expected '{kind}' after end")
-
-    def _previous_is_kw(self, kw: str) -> bool:
-        if self.current == 0:
-            return False
-        t = self.tokens[self.current - 1]
-        return t.kind == lexer.TokenKind.KEYWORD and t.lexeme == kw
-
-    def _previous_two_keywords_were_else_if(self) -> bool:
-        if self.current < 2:
-            return False
-        t1 = self.tokens[self.current - 2]
-        t2 = self.tokens[self.current - 1]
-        return (
-            t1.kind == lexer.TokenKind.KEYWORD
-            and t2.kind == lexer.TokenKind.KEYWORD
-            and t1.lexeme == "else"
-            and t2.lexeme == "if"
+        t = self.tokens[self.current]
+        return t.kind in _EXPR_START_KINDS or (
+            t.kind is _KEYWORD and t.lexeme in _EXPR_START_KEYWORDS
         )
 
-    def _try_keywords(self, seq: List[str]) -> bool:
-        save = self.current
-        for kw in seq:
-            if not self._match_kw(kw):
-                self.current = save
-                return False
-        return True
+    def _consume_pair_end(self, kind: str) -> None:
+        # Checks 'end <kind>' on the two tokens directly; the error messages
+        # are only formatted when the pair is missing.
+        tokens = self.tokens
+        t = tokens[self.current]
+        if t.kind is not _KEYWORD or t.lexeme != "end":
+            raise ParseError(f"Expected 'end' to close {kind}")
+        nxt = tokens[self.current + 1]
+        if nxt.kind is not _KEYWORD or nxt.lexeme != kind:
+            raise ParseError(f"Expected '{kind}' after end")
+        self.current += 2
 
     def _advance(self) -> lexer.Token:
-        if not self._is_at_end():
-            self.current += 1
-        return self.tokens[self.current - 1]
+        # Only called after a check matched the current token, so it is never
+        # the trailing EOF.
+        t = self.tokens[self.current]
+        self.current += 1
+        return t
 
     def _peek(self) -> lexer.Token:
         return self.tokens[self.current]
@@ -752,8 +828,22 @@ class Parser:
     def _previous(self) -> lexer.Token:
         return self.tokens[self.current - 1]
 
-    def _is_at_end(self) -> bool:
-        return self._peek().kind == lexer.TokenKind.EOF
+
+# Leading statement keyword -> unbound handler.
+Parser._STMT_DISPATCH = {
+    "add": Parser._add_statement,
+    "sub": Parser._sub_statement,
+    "subtract": Parser._sub_statement,
+    "make": Parser._make_statement,
+    "call": Parser._call_statement,
+    "return": Parser._return_statement,
+    "input": Parser._input_statement,
+    "set": Parser._set_statement,
+    "print": Parser._print_statement,
+    "if": Parser._if_statement,
+    "while": Parser._while_statement,
+    "for": Parser._for_statement,
+}
 
 
 __all__ = ["Parser", "ParseError"]
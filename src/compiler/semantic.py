@@ -13,7 +13,7 @@ Checks:
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Set, Tuple
 
 from . import ast
 
@@ -22,7 +22,7 @@ class SemanticError(Exception):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class TypeInfo:
     name: Optional[
         str
@@ -30,17 +30,20 @@ class TypeInfo:
     size: Optional[int] = None  # for containers with known literal size
 
 
-@dataclass
+@dataclass(slots=True)
 class ParamInfo:
     name: str
     type: Optional[str]
     has_default: bool
 
 
-@dataclass
+@dataclass(slots=True)
 class FunctionSig:
     name: str
     params: List[ParamInfo]
+    param_infos: List[TypeInfo]  # each parameter's binding inside the body
+    param_index: Dict[str, int]  # parameter name -> position
+    required_mask: int  # bit i set iff params[i] has no default
 
 
 Numeric = {"int", "float"}
@@ -48,27 +51,45 @@ LogicTypes = {"int", "float", "bool"}
 AllTypes = {"int", "float", "string", "bool", "list", "array"}
 ContainerTypes = {"list", "array"}
 
+# Operand classes with the not-yet-known types ("auto"/None) folded in, so a
+# check is one membership test.
+_NUMERIC_OR_UNKNOWN = frozenset({"int", "float", "auto", None})
+_LOGIC_OR_UNKNOWN = frozenset({"int", "float", "bool", "auto", None})
+
+# Declared type -> expression types that may be stored in it: itself, any
+# numeric type into a numeric one, and anything not yet known.
+_ASSIGNABLE_FROM = {
+    t: (_NUMERIC_OR_UNKNOWN if t in Numeric else frozenset({t, "auto", None}))
+    for t in AllTypes
+}
+
 
 class Analyzer:
+    _STMT_DISPATCH: Dict[type, Callable[["Analyzer", ast.Stmt], None]]
+    _EXPR_DISPATCH: Dict[
+        type, Callable[["Analyzer", ast.Expr, bool], Tuple[str, ast.Expr]]
+    ]
+
     def __init__(self, source: str):
-        self.env_stack: list[Dict[str, TypeInfo]] = [{}]
+        # name -> its bindings, innermost last; each scope frame holds the
+        # names it bound so popping the frame unwinds exactly those.
+        self.scopes: Dict[str, List[TypeInfo]] = {}
+        self.scope_frames: List[Set[str]] = [set()]
         self.functions: Dict[str, FunctionSig] = {}
         self.function_depth = 0
-        self.source_lines = source.splitlines()
+        # Kept whole; a line is only sliced out when an error is reported.
+        self.source = source
 
     def analyze(self, program: ast.Program) -> None:
         self._register_functions(program.functions)
         for fn in program.functions:
             self._analyze_function(fn)
-        for stmt in program.statements:
-            self._stmt(stmt)
-        self._fold_program(program)
+        self._stmts(program.statements)
 
     # --- statements ---
     def _block(self, body: list[ast.Stmt]):
         self._push_env()
-        for stmt in body:
-            self._stmt(stmt)
+        self._stmts(body)
         self._pop_env()
 
     def _register_functions(self, functions: List[ast.Function]):
@@ -76,25 +97,34 @@ class Analyzer:
             if fn.name in self.functions:
                 self._err(fn, f"function '{fn.name}' already defined")
             params: List[ParamInfo] = []
-            seen: set[str] = set()
-            for idx, p in enumerate(fn.params):
-                if p.name in seen:
+            param_infos: List[TypeInfo] = []
+            param_index: Dict[str, int] = {}
+            required_mask = 0
+            # One frame per signature, filled as parameters are read, so a
+            # default sees exactly the parameters before it.
+            self._push_env()
+            for p in fn.params:
+                if self._declared_here(p.name):
                     self._err(p, f"duplicate parameter '{p.name}'")
-                seen.add(p.name)
                 inferred_type = p.type
                 if p.default is not None:
-                    self._push_env()
-                    for earlier in params:
-                        self._env()[earlier.name] = TypeInfo(earlier.type or "auto")
-                    default_type = self._expr(p.default)
-                    self._pop_env()
+                    default_type, _ = self._expr(p.default)
                     if inferred_type:
                         self._ensure_assignable(p, inferred_type, default_type)
                     else:
                         inferred_type = default_type
+                else:
+                    required_mask |= 1 << len(params)
+                param_index[p.name] = len(params)
                 params.append(ParamInfo(p.name, inferred_type, p.default is not None))
                 p.type = inferred_type
-            self.functions[fn.name] = FunctionSig(fn.name, params)
+                info = TypeInfo(inferred_type or "auto")
+                param_infos.append(info)
+                self._define(p.name, info)
+            self._pop_env()
+            self.functions[fn.name] = FunctionSig(
+                fn.name, params, param_infos, param_index, required_mask
+            )
 
     def _analyze_function(self, fn: ast.Function):
         sig = self.functions.get(fn.name)
@@ -102,10 +132,9 @@ class Analyzer:
             return
         self._push_env()
         self.function_depth += 1
-        for p in sig.params:
-            self._env()[p.name] = TypeInfo(p.type or "auto")
-        for stmt in fn.body:
-            self._stmt(stmt)
+        for p, info in zip(sig.params, sig.param_infos):
+            self._define(p.name, info)
+        self._stmts(fn.body)
         self.function_depth -= 1
         self._pop_env()
 
@@ -114,380 +143,396 @@ class Analyzer:
         if not sig:
             known = ", ".join(sorted(self.functions.keys())) or "none"
             self._err(node, f"undefined function '{node.name}'. known: {known}")
-        provided: dict[str, str] = {}
+        params = sig.params
+        provided = 0  # bit i set once params[i] has an argument
         positional_index = 0
+        expr = self._expr
         for arg in node.args:
-            arg_type = self._expr(arg.value)
-            param = None
+            arg_type, arg.value = expr(arg.value, True)
             if arg.name:
-                for p in sig.params:
-                    if p.name == arg.name:
-                        param = p
-                        break
-                if param is None:
+                idx = sig.param_index.get(arg.name)
+                if idx is None:
                     self._err(
                         arg,
                         f"unknown parameter '{arg.name}' for function '{node.name}'",
                     )
-                if arg.name in provided:
+                if provided >> idx & 1:
                     self._err(arg, f"duplicate argument for '{arg.name}'")
             else:
-                if positional_index >= len(sig.params):
+                idx = positional_index
+                if idx >= len(params):
                     self._err(arg, f"too many arguments for '{node.name}'")
-                param = sig.params[positional_index]
                 positional_index += 1
+            param = params[idx]
             if param.type:
                 self._ensure_assignable(arg, param.type, arg_type)
-            provided[param.name] = arg_type
-
-        for p in sig.params:
-            if p.name not in provided and not p.has_default:
-                self._err(
-                    node, f"missing argument for '{p.name}' in call to '{node.name}'"
-                )
-
-    def _stmt(self, node: ast.Stmt):
-        if isinstance(node, ast.Declaration):
-            if self._env().get(node.name):
+            provided |= 1 << idx
+
+        missing = sig.required_mask & ~provided
+        if missing:
+            # Report the first one in declaration order.
+            p = params[(missing & -missing).bit_length() - 1]
+            self._err(node, f"missing argument for '{p.name}' in call to '{node.name}'")
+
+    def _stmts(self, body: List[ast.Stmt]):
+        dispatch = self._STMT_DISPATCH.get
+        for node in body:
+            handler = dispatch(type(node))
+            if handler is None:
+                self._err(node, f"Unhandled statement {node}")
+            handler(self, node)
+
+    def _declaration_stmt(self, node: ast.Declaration):
+        if self._declared_here(node.name):
+            self._err(node, f"variable '{node.name}' already declared")
+        if node.type and node.type not in AllTypes:
+            self._err(node, f"unknown type '{node.type}'")
+        literal_size = None
+        if node.type in ContainerTypes and node.size is not None:
+            size_type, _ = self._expr(node.size)
+            if size_type not in Numeric:
+                self._err(node, "container size must be numeric")
+            literal_size = self._literal_int_value(node.size)
+        self._define(node.name, TypeInfo(node.type or "auto", literal_size))
+
+    def _input_stmt(self, node: ast.Input):
+        if node.type:
+            if self._declared_here(node.name):
                 self._err(node, f"variable '{node.name}' already declared")
-            if node.type and node.type not in AllTypes:
+            if node.type not in AllTypes:
                 self._err(node, f"unknown type '{node.type}'")
-            literal_size = None
-            if node.type in ContainerTypes and node.size is not None:
-                size_type = self._expr(node.size)
-                if size_type not in Numeric:
-                    self._err(node, "container size must be numeric")
-                literal_size = self._literal_int_value(node.size)
-            self._env()[node.name] = TypeInfo(node.type or "auto", literal_size)
-            return
-        if isinstance(node, ast.Input):
-            if node.type:
-                if self._env().get(node.name):
-                    self._err(node, f"variable '{node.name}' already declared")
-                if node.type not in AllTypes:
-                    self._err(node, f"unknown type '{node.type}'")
-                self._env()[node.name] = TypeInfo(node.type)
-            else:
-                existing = self._lookup(node.name)
-                if not existing:
-                    self._err(node, f"variable '{node.name}' not declared before input")
-            return
-        if isinstance(node, ast.Assign):
-            t = self._expr(node.expr)
-            if node.type:
-                if node.type not in AllTypes:
-                    self._err(node, f"unknown type '{node.type}'")
-                existing = self._lookup(node.name)
-                if existing and existing.name not in {None, "auto", node.type}:
-                    self._ensure_assignable(node, existing.name, node.type)
-                self._ensure_assignable(node, node.type, t)
-                self._env()[node.name] = TypeInfo(node.type)
+            self._define(node.name, TypeInfo(node.type))
+        else:
+            existing = self._lookup(node.name)
+            if not existing:
+                self._err(node, f"variable '{node.name}' not declared before input")
+
+    def _assign_stmt(self, node: ast.Assign):
+        t, node.expr = self._expr(node.expr, True)
+        if node.type:
+            if node.type not in AllTypes:
+                self._err(node, f"unknown type '{node.type}'")
+            existing = self._lookup(node.name)
+            if existing and existing.name not in {None, "auto", node.type}:
+                self._ensure_assignable(node, existing.name, node.type)
+            self._ensure_assignable(node, node.type, t)
+            self._define(node.name, TypeInfo(node.type))
+        else:
+            existing = self._lookup(node.name)
+            if existing:
+                self._ensure_assignable(node, existing.name, t)
+                self._define(node.name, existing)  # ensure current scope sees it
             else:
-                existing = self._lookup(node.name)
-                if existing:
-                    self._ensure_assignable(node, existing.name, t)
-                    self._env()[node.name] = existing  # ensure current scope sees it
-                else:
-                    self._env()[node.name] = TypeInfo(t)
-            return
-        if isinstance(node, ast.IndexAssign):
-            base = self._lookup(node.name)
-            if not base:
-                self._err(node, f"variable '{node.name}' not declared")
-            if base.name not in ContainerTypes:
-                self._err(node, f"indexing requires list/array (got {base.name})")
-            idx_type = self._expr(node.index)
-            if idx_type not in Numeric:
-                self._err(node, "index must be numeric")
-            idx_literal = self._literal_int_value(node.index)
-            if base.size is not None and idx_literal is not None:
-                if idx_literal < 0 or idx_literal >= base.size:
-                    self._err(
-                        node,
-                        f"index {idx_literal} out of bounds for '{node.name}' of size {base.size}",
-                    )
-            val_type = self._expr(node.expr)
-            if val_type not in Numeric:
-                self._err(node, "container elements must be numeric")
-            return
-        if isinstance(node, ast.Print):
-            for value in node.values:
-                self._expr(value)
-            return
-        if isinstance(node, ast.If):
-            self._expr(node.first.cond)
-            self._block(node.first.body)
-            for br in node.elifs:
-                self._expr(br.cond)
-                self._block(br.body)
-            if node.else_body:
-                self._block(node.else_body)
-            return
-        if isinstance(node, ast.While):
-            self._expr(node.cond)
-            self._block(node.body)
-            return
-        if isinstance(node, ast.For):
-            start_t = self._expr(node.start)
-            end_t = self._expr(node.end)
-            if start_t not in Numeric or end_t not in Numeric:
-                self._err(node, f"for bounds must be numeric (got {start_t}, {end_t})")
-            self._push_env()
-            self._env()[node.var] = TypeInfo("int")
-            for s in node.body:
-                self._stmt(s)
-            self._pop_env()
-            return
-        if isinstance(node, ast.Call):
-            self._check_call(node)
-            return
-        if isinstance(node, ast.Return):
-            if self.function_depth <= 0:
-                self._err(node, "'return' outside function")
-            for v in node.values:
-                self._expr(v)
-            return
-        self._err(node, f"Unhandled statement {node}")
+                self._define(node.name, TypeInfo(t))
+
+    def _index_assign_stmt(self, node: ast.IndexAssign):
+        base = self._lookup(node.name)
+        if not base:
+            self._err(node, f"variable '{node.name}' not declared")
+        if base.name not in ContainerTypes:
+            self._err(node, f"indexing requires list/array (got {base.name})")
+        idx_type, _ = self._expr(node.index)
+        if idx_type not in Numeric:
+            self._err(node, "index must be numeric")
+        idx_literal = self._literal_int_value(node.index)
+        if base.size is not None and idx_literal is not None:
+            if idx_literal < 0 or idx_literal >= base.size:
+                self._err(
+                    node,
+                    f"index {idx_literal} out of bounds for '{node.name}' of size {base.size}",
+                )
+        val_type, _ = self._expr(node.expr)
+        if val_type not in Numeric:
+            self._err(node, "container elements must be numeric")
+
+    def _print_stmt(self, node: ast.Print):
+        values = node.values
+        expr = self._expr
+        for i, value in enumerate(values):
+            _, values[i] = expr(value, True)
+
+    def _if_stmt(self, node: ast.If):
+        first = node.first
+        _, first.cond = self._expr(first.cond, True)
+        self._block(first.body)
+        for br in node.elifs:
+            _, br.cond = self._expr(br.cond, True)
+            self._block(br.body)
+        if node.else_body:
+            self._block(node.else_body)
+
+    def _while_stmt(self, node: ast.While):
+        _, node.cond = self._expr(node.cond, True)
+        self._block(node.body)
+
+    def _for_stmt(self, node: ast.For):
+        start_t, node.start = self._expr(node.start, True)
+        end_t, node.end = self._expr(node.end, True)
+        if start_t not in Numeric or end_t not in Numeric:
+            self._err(node, f"for bounds must be numeric (got {start_t}, {end_t})")
+        self._push_env()
+        self._define(node.var, TypeInfo("int"))
+        self._stmts(node.body)
+        self._pop_env()
+
+    def _return_stmt(self, node: ast.Return):
+        if self.function_depth <= 0:
+            self._err(node, "'return' outside function")
+        expr = self._expr
+        for v in node.values:
+            expr(v)
 
     # --- expressions ---
-    def _expr(self, node: ast.Expr) -> str:
-        if isinstance(node, ast.Number):
-            return "float" if self._is_float_literal(node.value) else "int"
-        if isinstance(node, ast.String):
-            return "string"
-        if isinstance(node, ast.Var):
+    def _expr(self, node: ast.Expr, fold: bool = False) -> Tuple[str, ast.Expr]:
+        # Returns the node's type and, when `fold` is set, the node with its
+        # constant subexpressions collapsed; otherwise the node is untouched.
+        cls = type(node)
+        # Var and Number are typed here directly, skipping the table and a call.
+        if cls is ast.Var:
             t = self._lookup(node.name)
             if not t:
                 self._err(node, f"undefined variable '{node.name}'")
-            return t.name or "auto"
-        if isinstance(node, ast.Index):
-            base = self._lookup(node.name)
-            if not base:
-                self._err(node, f"variable '{node.name}' not declared")
-            if base.name not in ContainerTypes:
-                self._err(node, f"indexing requires list/array (got {base.name})")
-            idx_type = self._expr(node.index)
-            if idx_type not in Numeric:
-                self._err(node, "index must be numeric")
-            idx_literal = self._literal_int_value(node.index)
-            if base.size is not None and idx_literal is not None:
-                if idx_literal < 0 or idx_literal >= base.size:
-                    self._err(
-                        node,
-                        f"index {idx_literal} out of bounds for '{node.name}' of size {base.size}",
-                    )
-            return "float"
-        if isinstance(node, ast.Unary):
-            op = node.op
-            t = self._expr(node.right)
-            if op in {"+", "-"}:
-                if not self._is_numeric(t):
-                    self._err(node, f"unary {op} requires numeric operand (got {t})")
-                return t
-            if op in {"!", "not"}:
-                if not self._is_logic(t):
-                    self._err(
-                        node,
-                        f"unary {op} requires numeric/bool-like operand (got {t})",
-                    )
-                return "bool"
-            self._err(node, f"unhandled unary op {op}")
-        if isinstance(node, ast.Binary):
-            lt = self._expr(node.left)
-            rt = self._expr(node.right)
-            op = node.op
-            if op in {"+", "-", "*", "/", "add", "subtract", "multiply", "divide"}:
-                if not self._is_numeric(lt) or not self._is_numeric(rt):
-                    self._err(
-                        node,
-                        f"arithmetic '{op}' requires numeric operands (got {lt}, {rt})",
-                    )
-                return "float" if "float" in (lt, rt) else lt or rt or "int"
-            if op in {"==", "!="}:
-                if lt == rt:
-                    return "bool"
-                if self._is_numeric(lt) and self._is_numeric(rt):
-                    return "bool"
+            return t.name or "auto", node
+        if cls is ast.Number:
+            return ("float" if node.is_float else "int"), node
+        handler = self._EXPR_DISPATCH.get(cls)
+        if handler is None:
+            self._err(node, f"Unhandled expr {node}")
+        return handler(self, node, fold)
+
+    def _string_expr(self, node: ast.String, fold: bool) -> Tuple[str, ast.Expr]:
+        return "string", node
+
+    def _index_expr(self, node: ast.Index, fold: bool) -> Tuple[str, ast.Expr]:
+        base = self._lookup(node.name)
+        if not base:
+            self._err(node, f"variable '{node.name}' not declared")
+        if base.name not in ContainerTypes:
+            self._err(node, f"indexing requires list/array (got {base.name})")
+        idx_type, _ = self._expr(node.index)
+        if idx_type not in Numeric:
+            self._err(node, "index must be numeric")
+        idx_literal = self._literal_int_value(node.index)
+        if base.size is not None and idx_literal is not None:
+            if idx_literal < 0 or idx_literal >= base.size:
+                self._err(
+                    node,
+                    f"index {idx_literal} out of bounds for '{node.name}' of size {base.size}",
+                )
+        return "float", node
+
+    def _unary_expr(self, node: ast.Unary, fold: bool) -> Tuple[str, ast.Expr]:
+        op = node.op
+        t, right = self._expr(node.right, fold)
+        if op in {"+", "-"}:
+            if not self._is_numeric(t):
+                self._err(node, f"unary {op} requires numeric operand (got {t})")
+            if fold:
+                node.right = right
+                if type(right) is ast.Number:
+                    num = float(right.value)
+                    return t, self._number(num if op == "+" else -num, node)
+            return t, node
+        if op in {"!", "not"}:
+            if not self._is_logic(t):
+                self._err(
+                    node,
+                    f"unary {op} requires numeric/bool-like operand (got {t})",
+                )
+            if fold:
+                node.right = right
+            return "bool", node
+        self._err(node, f"unhandled unary op {op}")
+
+    def _binary_expr(self, node: ast.Binary, fold: bool) -> Tuple[str, ast.Expr]:
+        lt, left = self._expr(node.left, fold)
+        rt, right = self._expr(node.right, fold)
+        op = node.op
+        if op in {"+", "-", "*", "/", "add", "subtract", "multiply", "divide"}:
+            if not self._is_numeric(lt) or not self._is_numeric(rt):
+                self._err(
+                    node,
+                    f"arithmetic '{op}' requires numeric operands (got {lt}, {rt})",
+                )
+            t = "float" if "float" in (lt, rt) else lt or rt or "int"
+            if fold:
+                node.left = left
+                node.right = right
+                if type(left) is ast.Number and type(right) is ast.Number:
+                    try:
+                        val = self._eval_binary(op, left.value, right.value)
+                    except (ValueError, ZeroDivisionError):
+                        pass
+                    else:
+                        return t, self._number(val, node)
+            return t, node
+        if op in {"==", "!="}:
+            if lt != rt and not (self._is_numeric(lt) and self._is_numeric(rt)):
                 self._err(node, f"incompatible types for equality: {lt} vs {rt}")
-            if op in {">", "<", ">=", "<="}:
-                if self._is_numeric(lt) and self._is_numeric(rt):
-                    return "bool"
+        elif op in {">", "<", ">=", "<="}:
+            if not self._is_numeric(lt) or not self._is_numeric(rt):
                 self._err(
                     node,
                     f"ordering comparison requires numeric operands (got {lt}, {rt})",
                 )
-            if op in {"and", "&", "or", "|"}:
-                if not self._is_logic(lt) or not self._is_logic(rt):
-                    self._err(
-                        node,
-                        f"logical '{op}' requires numeric/bool-like operands (got {lt}, {rt})",
-                    )
-                return "bool"
+        elif op in {"and", "&", "or", "|"}:
+            if not self._is_logic(lt) or not self._is_logic(rt):
+                self._err(
+                    node,
+                    f"logical '{op}' requires numeric/bool-like operands (got {lt}, {rt})",
+                )
+        else:
             self._err(node, f"unhandled binary op {op}")
-        if isinstance(node, ast.Power):
-            bt = self._expr(node.base)
-            et = self._expr(node.exponent)
-            if not self._is_numeric(bt) or not self._is_numeric(et):
-                self._err(node, f"power requires numeric operands (got {bt}, {et})")
-            return "float" if "float" in (bt, et) else "int"
-        self._err(node, f"Unhandled expr {node}")
+        # Comparisons and logic never fold themselves, only their operands.
+        if fold:
+            node.left = left
+            node.right = right
+        return "bool", node
+
+    def _power_expr(self, node: ast.Power, fold: bool) -> Tuple[str, ast.Expr]:
+        bt, base = self._expr(node.base, fold)
+        et, exponent = self._expr(node.exponent, fold)
+        if not self._is_numeric(bt) or not self._is_numeric(et):
+            self._err(node, f"power requires numeric operands (got {bt}, {et})")
+        t = "float" if "float" in (bt, et) else "int"
+        if fold:
+            node.base = base
+            node.exponent = exponent
+            if type(base) is ast.Number and type(exponent) is ast.Number:
+                try:
+                    val = float(base.value) ** float(exponent.value)
+                except (OverflowError, ZeroDivisionError):
+                    pass
+                else:
+                    if type(val) is float:
+                        return t, self._number(val, node)
+        return t, node
 
     # --- env helpers ---
-    def _env(self) -> Dict[str, TypeInfo]:
-        return self.env_stack[-1]
+    def _define(self, name: str, info: TypeInfo):
+        frame = self.scope_frames[-1]
+        if name in frame:
+            self.scopes[name][-1] = info
+        else:
+            frame.add(name)
+            self.scopes.setdefault(name, []).append(info)
+
+    def _declared_here(self, name: str) -> bool:
+        return name in self.scope_frames[-1]
 
     def _push_env(self):
-        self.env_stack.append({})
+        self.scope_frames.append(set())
 
     def _pop_env(self):
-        if len(self.env_stack) > 1:
-            self.env_stack.pop()
+        if len(self.scope_frames) > 1:
+            scopes = self.scopes
+            for name in self.scope_frames.pop():
+                bindings = scopes[name]
+                bindings.pop()
+                if not bindings:
+                    del scopes[name]
 
     def _lookup(self, name: str) -> Optional[TypeInfo]:
-        for env in reversed(self.env_stack):
-            if name in env:
-                return env[name]
-        return None
+        bindings = self.scopes.get(name)
+        return bindings[-1] if bindings else None
 
     def _ensure_assignable(self, node: ast.Node, target_type: str, expr_type: str):
-        if target_type in {None, "auto"}:
-            return
-        if expr_type in {None, "auto"}:
-            return
-        if target_type == expr_type:
-            return
-        if target_type == "float" and expr_type in {"int", "float"}:
-            return
-        if target_type in Numeric and expr_type in Numeric:
+        allowed = _ASSIGNABLE_FROM.get(target_type)
+        if allowed is not None:
+            if expr_type in allowed:
+                return
+        # Untyped targets take anything; other names (parameter annotations
+        # are not checked against AllTypes) take themselves or unknowns.
+        elif (
+            target_type in {None, "auto"}
+            or expr_type in {None, "auto"}
+            or target_type == expr_type
+        ):
             return
         self._err(node, f"cannot assign {expr_type} to {target_type}")
 
     # --- folding ---
-    def _fold_program(self, program: ast.Program) -> None:
-        program.functions = [self._fold_function(fn) for fn in program.functions]
-        program.statements = [self._fold_stmt(s) for s in program.statements]
-
-    def _fold_stmt(self, stmt: ast.Stmt) -> ast.Stmt:
-        if isinstance(stmt, ast.Assign):
-            stmt.expr = self._fold_expr(stmt.expr)
-        elif isinstance(stmt, ast.Print):
-            stmt.values = [self._fold_expr(v) for v in stmt.values]
-        elif isinstance(stmt, ast.Call):
-            stmt.args = [
-                ast.Arg(
-                    name=a.name, value=self._fold_expr(a.value), line=a.line, col=a.col
-                )
-                for a in stmt.args
-            ]
-        elif isinstance(stmt, ast.If):
-            stmt.first.cond = self._fold_expr(stmt.first.cond)
-            stmt.first.body = [self._fold_stmt(s) for s in stmt.first.body]
-            stmt.elifs = [
-                ast.IfBranch(
-                    cond=self._fold_expr(br.cond),
-                    body=[self._fold_stmt(s) for s in br.body],
-                    line=br.line,
-                    col=br.col,
-                )
-                for br in stmt.elifs
-            ]
-            if stmt.else_body:
-                stmt.else_body = [self._fold_stmt(s) for s in stmt.else_body]
-        elif isinstance(stmt, ast.While):
-            stmt.cond = self._fold_expr(stmt.cond)
-            stmt.body = [self._fold_stmt(s) for s in stmt.body]
-        elif isinstance(stmt, ast.For):
-            stmt.start = self._fold_expr(stmt.start)
-            stmt.end = self._fold_expr(stmt.end)
-            stmt.body = [self._fold_stmt(s) for s in stmt.body]
-        return stmt
-
-    def _fold_function(self, fn: ast.Function) -> ast.Function:
-        fn.params = [fn_param for fn_param in fn.params]
-        fn.body = [self._fold_stmt(s) for s in fn.body]
-        return fn
-
-    def _fold_expr(self, expr: ast.Expr) -> ast.Expr:
-        if isinstance(expr, ast.Binary):
-            expr.left = self._fold_expr(expr.left)
-            expr.right = self._fold_expr(expr.right)
-            if isinstance(expr.left, ast.Number) and isinstance(expr.right, ast.Number):
-                try:
-                    val = self._eval_binary(expr.op, expr.left.value, expr.right.value)
-                    return ast.Number(val, line=expr.line, col=expr.col)
-                except Exception:
-                    return expr
-        elif isinstance(expr, ast.Unary):
-            expr.right = self._fold_expr(expr.right)
-            if isinstance(expr.right, ast.Number) and expr.op in {"+", "-"}:
-                try:
-                    num = float(expr.right.value)
-                    val = num if expr.op == "+" else -num
-                    return ast.Number(
-                        self._num_to_lex(val), line=expr.line, col=expr.col
-                    )
-                except Exception:
-                    return expr
-        elif isinstance(expr, ast.Power):
-            expr.base = self._fold_expr(expr.base)
-            expr.exponent = self._fold_expr(expr.exponent)
-            if isinstance(expr.base, ast.Number) and isinstance(
-                expr.exponent, ast.Number
-            ):
-                try:
-                    val = float(expr.base.value) ** float(expr.exponent.value)
-                    return ast.Number(
-                        self._num_to_lex(val), line=expr.line, col=expr.col
-                    )
-                except Exception:
-                    return expr
-        return expr
-
-    def _eval_binary(self, op: str, l: str, r: str) -> str:
+    def _eval_binary(self, op: str, l: str, r: str) -> float:
         lf = float(l)
         rf = float(r)
         if op in {"+", "add"}:
-            return self._num_to_lex(lf + rf)
+            return lf + rf
         if op in {"-", "subtract"}:
-            return self._num_to_lex(lf - rf)
+            return lf - rf
         if op in {"*", "multiply"}:
-            return self._num_to_lex(lf * rf)
+            return lf * rf
         if op in {"/", "divide"}:
-            return self._num_to_lex(lf / rf)
+            return lf / rf
         raise ValueError(f"unsupported op {op}")
 
-    def _num_to_lex(self, val: float) -> str:
+    def _number(self, val: float, at: ast.Expr) -> ast.Number:
+        # Folded literal at `at`'s position; integral values print without ".0".
         if val.is_integer():
-            return str(int(val))
-        return str(val)
+            return ast.Number(str(int(val)), False, at.line, at.col)
+        text = repr(val)
+        return ast.Number(text, "." in text, at.line, at.col)
 
     def _literal_int_value(self, expr: ast.Expr) -> Optional[int]:
-        if isinstance(expr, ast.Number) and not self._is_float_literal(expr.value):
-            try:
-                return int(expr.value)
-            except ValueError:
-                return None
+        # Parsed integer lexemes are plain digits with an optional sign. The
+        # parser folds a sign into the literal, so `xs[-1]` is bounds-checked
+        # here instead of reaching C++ as an out-of-range vector access.
+        if type(expr) is ast.Number and not expr.is_float:
+            return int(expr.value)
         return None
 
     # --- error reporting ---
     def _err(self, node: ast.Node, msg: str):
-        line = getattr(node, "line", None)
-        col = getattr(node, "col", None)
-        if line and 1 <= line <= len(self.source_lines):
-            src_line = self.source_lines[line - 1]
+        # ast.Node defaults line/col to None, so this holds for unknown nodes too.
+        line = node.line
+        col = node.col
+        src_line = self._source_line(line) if line and line > 0 else None
+        if src_line is not None:
             caret = " " * (col - 1 if col and col > 0 else 0) + "^"
             raise SemanticError(f"{msg} at {line}:{col}\n    {src_line}\n    {caret}")
         raise SemanticError(msg)
 
-    # --- helpers ---
-    def _is_float_literal(self, lexeme: str) -> bool:
-        return "." in lexeme
+    def _source_line(self, line: int) -> Optional[str]:
+        # Lines are counted by "\n" as the lexer does; a trailing "\r" is dropped.
+        source = self.source
+        start = 0
+        for _ in range(line - 1):
+            start = source.find("\n", start) + 1
+            if not start:
+                return None
+        if start >= len(source):
+            return None
+        end = source.find("\n", start)
+        text = source[start:] if end == -1 else source[start:end]
+        return text[:-1] if text.endswith("\r") else text
 
+    # --- helpers ---
     def _is_numeric(self, typ: Optional[str]) -> bool:
-        return typ in Numeric or typ in {"auto", None}
+        return typ in _NUMERIC_OR_UNKNOWN
 
     def _is_logic(self, typ: Optional[str]) -> bool:
-        return typ in LogicTypes or typ in {"auto", None}
+        return typ in _LOGIC_OR_UNKNOWN
+
+
+# Exact node class -> unbound checker, looked up by Analyzer._stmts / _expr.
+Analyzer._STMT_DISPATCH = {
+    ast.Declaration: Analyzer._declaration_stmt,
+    ast.Input: Analyzer._input_stmt,
+    ast.Assign: Analyzer._assign_stmt,
+    ast.IndexAssign: Analyzer._index_assign_stmt,
+    ast.Print: Analyzer._print_stmt,
+    ast.If: Analyzer._if_stmt,
+    ast.While: Analyzer._while_stmt,
+    ast.For: Analyzer._for_stmt,
+    ast.Call: Analyzer._check_call,
+    ast.Return: Analyzer._return_stmt,
+}
+Analyzer._EXPR_DISPATCH = {
+    ast.String: Analyzer._string_expr,
+    ast.Index: Analyzer._index_expr,
+    ast.Unary: Analyzer._unary_expr,
+    ast.Binary: Analyzer._binary_expr,
+    ast.Power: Analyzer._power_expr,
+}
 
 
 __all__ = ["Analyzer", "SemanticError", "TypeInfo"]
@@ -69,12 +69,11 @@ def main() -> int:
         log_step("semantic checks")
         Analyzer(src).analyze(program)
         log_step("codegen")
-        cpp = Codegen().generate(program)
+        Codegen().generate_to(program, out_path)
     except (LexerError, ParseError, SemanticError, Exception) as e:
         log_error(str(e))
         return 1
 
-    out_path.write_text(cpp, encoding="utf-8")
     print(f"wrote {out_path}")
 
     if args.compile:
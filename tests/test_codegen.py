@@ -1,6 +1,8 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 ROOT = Path(__file__).resolve().parents[1]
 SRC = ROOT / "src"
 if str(SRC) not in sys.path:
@@ -8,6 +10,7 @@ if str(SRC) not in sys.path:
 
 from compiler.lexer import Lexer
 from compiler.parser import Parser
+from compiler import ast
 from compiler.codegen import Codegen
 
 
@@ -73,3 +76,75 @@ def test_return_codegen_multiple():
     cpp = transpile(code)
     assert "auto swap" in cpp
     assert "std::make_tuple" in cpp
+
+
+def test_unhandled_node_raises_type_error():
+    with pytest.raises(TypeError):
+        Codegen()._stmt(ast.Stmt())
+    with pytest.raises(TypeError):
+        Codegen()._expr_code(ast.Expr())
+
+
+def test_nested_blocks_indent_consistently():
+    code = "set x to 1\nwhile x < 3 do\n if x == 1 then\n print x\n end if\n set x to x + 1\nend while"
+    lines = transpile(code).splitlines()
+    assert "    while ((x < 3)) {" in lines
+    assert "        if ((x == 1)) {" in lines
+    assert "            cout << x << endl;" in lines
+
+
+def test_func_name_sanitizes_and_caches():
+    gen = Codegen()
+    assert gen._func_name("my func") == "my_func"
+    assert gen._func_name("2fast") == "fn_2fast"
+    assert gen._func_name("") == "fn"
+    assert gen._func_name("my func") is gen._func_name("my func")
+
+
+def test_binary_result_type():
+    gen = Codegen()
+    assert gen._binary_result_type("+", "int", "int") == "int"
+    assert gen._binary_result_type("multiply", "int", "float") == "float"
+    assert gen._binary_result_type("-", None, "int") == "int"
+    assert gen._binary_result_type("<=", "int", "float") == "bool"
+    assert gen._binary_result_type("?", "int", "int") is None
+
+
+def test_nested_return_makes_function_auto():
+    code = 'function "sign"(x:int)\n if x < 0 then\n return -1\n end if\n return 1\nend function\nfunction "noop"()\n return\nend function'
+    cpp = transpile(code)
+    assert "auto sign(int x) {" in cpp
+    assert "void noop() {" in cpp
+    assert "    if ((x < 0)) {\n        return -1;" in cpp
+
+
+def test_string_literals_keep_escapes_and_escape_newlines():
+    cpp = transpile('print "say \\"hi\\""\nprint "two\nlines"')
+    assert 'cout << "say \\"hi\\"" << endl;' in cpp
+    assert 'cout << "two\\nlines" << endl;' in cpp
+
+
+def test_print_list_uses_fmt_vector():
+    cpp = transpile("make xs as list of size 3\nprint xs, xs[0]")
+    assert "std::vector<double> xs(3, 0.0);" in cpp
+    assert "cout << write_runtime::fmt_vector(xs) << xs[0] << endl;" in cpp
+
+
+def test_generate_to_matches_generate(tmp_path):
+    program = Parser(Lexer('set x to 2\nprint "x=" x').scan()).parse()
+    expected = Codegen().generate(program)
+    out = tmp_path / "prog.cpp"
+    Codegen().generate_to(program, out)
+    assert out.read_text(encoding="utf-8") == expected
+
+
+def test_generate_to_keeps_existing_output_on_failure(tmp_path):
+    class Unsupported(ast.Stmt):
+        pass
+
+    out = tmp_path / "prog.cpp"
+    out.write_text("// previous build\n", encoding="utf-8")
+    with pytest.raises(TypeError):
+        Codegen().generate_to(ast.Program([], [Unsupported()]), out)
+    assert out.read_text(encoding="utf-8") == "// previous build\n"
+    assert [p.name for p in tmp_path.iterdir()] == ["prog.cpp"]
@@ -9,7 +9,7 @@ SRC = ROOT / "src"
 if str(SRC) not in sys.path:
     sys.path.append(str(SRC))
 
-from compiler.lexer import Lexer, TokenKind  # noqa: E402
+from compiler.lexer import Lexer, LexerError, TokenKind  # noqa: E402
 
 
 def kinds(code: str):
@@ -101,3 +101,142 @@ def test_function_tokens():
 def test_return_tokens():
     tokens = kinds('function "f"()\nreturn 1, 2\nend function')
     assert TokenKind.KEYWORD in tokens
+
+
+def test_lex_cli_multiple_files(tmp_path, capsys):
+    from compiler import lex_cli
+
+    a = tmp_path / "a.write"
+    b = tmp_path / "b.write"
+    a.write_text("print 1", encoding="utf-8")
+    b.write_text('print "x', encoding="utf-8")
+    assert lex_cli.main([str(a), str(b)]) == 1
+    out = capsys.readouterr().out
+    assert out.index(f"==> {a} <==") < out.index(f"==> {b} <==")
+    assert "NUMBER\t'1'\t(line 1)" in out
+    assert "lexer error: Unterminated string" in out
+
+
+def test_all_operators():
+    assert kinds("+ - * / ^ ( ) , : [ ] ! & | == = != > < >= <=") == [
+        TokenKind.PLUS,
+        TokenKind.MINUS,
+        TokenKind.STAR,
+        TokenKind.SLASH,
+        TokenKind.CARET,
+        TokenKind.LPAREN,
+        TokenKind.RPAREN,
+        TokenKind.COMMA,
+        TokenKind.COLON,
+        TokenKind.LBRACKET,
+        TokenKind.RBRACKET,
+        TokenKind.BANG,
+        TokenKind.AMP,
+        TokenKind.PIPE,
+        TokenKind.EQEQ,
+        TokenKind.EQ,
+        TokenKind.NEQ,
+        TokenKind.GT,
+        TokenKind.LT,
+        TokenKind.GTE,
+        TokenKind.LTE,
+        TokenKind.EOF,
+    ]
+    assert [t.lexeme for t in Lexer("a>=b").scan()] == ["a", ">=", "b", ""]
+
+
+def test_comments_are_skipped():
+    tokens = Lexer("# header\nprint 1 # trailing\n#").scan()
+    assert [(t.kind, t.lexeme, t.line) for t in tokens] == [
+        (TokenKind.KEYWORD, "print", 2),
+        (TokenKind.NUMBER, "1", 2),
+        (TokenKind.EOF, "", 3),
+    ]
+
+
+def test_string_escapes_and_multiline_positions():
+    tokens = Lexer('print "a \\" b\\\\" "x\ny" 1').scan()
+    assert tokens[1].kind == TokenKind.STRING
+    assert tokens[1].lexeme == 'a \\" b\\\\'
+    assert tokens[2].lexeme == "x\ny"
+    assert (tokens[3].lexeme, tokens[3].line) == ("1", 2)
+
+
+def test_numbers_and_identifiers():
+    tokens = Lexer("x_1 12.5 7 café 2x").scan()
+    assert [(t.kind, t.lexeme) for t in tokens] == [
+        (TokenKind.IDENT, "x_1"),
+        (TokenKind.NUMBER, "12.5"),
+        (TokenKind.NUMBER, "7"),
+        (TokenKind.IDENT, "café"),
+        (TokenKind.NUMBER, "2"),
+        (TokenKind.IDENT, "x"),
+        (TokenKind.EOF, ""),
+    ]
+
+
+def test_trailing_dot_is_not_part_of_number():
+    with pytest.raises(Exception):
+        Lexer("3.").scan()
+
+
+def test_keyword_lexemes_are_interned():
+    source = "".join(["se", "t x to 1"])  # built at runtime, not a code constant
+    kw = Lexer(source).scan()[0]
+    assert kw.kind == TokenKind.KEYWORD
+    assert kw.lexeme is sys.intern("set")
+
+
+def test_whitespace_runs_track_lines():
+    tokens = Lexer("set\t \r\n\n   x\n").scan()
+    assert [(t.lexeme, t.line) for t in tokens] == [("set", 1), ("x", 3), ("", 4)]
+
+
+def test_token_columns_point_at_token_start():
+    tokens = Lexer('set x to 10\n  print "a\nb" >= y').scan()
+    assert [(t.lexeme, t.line, t.col) for t in tokens] == [
+        ("set", 1, 1),
+        ("x", 1, 5),
+        ("to", 1, 7),
+        ("10", 1, 10),
+        ("print", 2, 3),
+        ("a\nb", 2, 9),
+        (">=", 3, 4),
+        ("y", 3, 7),
+        ("", 3, 8),
+    ]
+
+
+def test_unhandled_character_reports_its_column():
+    with pytest.raises(Exception, match="'@' at 2:3"):
+        Lexer("x\n  @").scan()
+
+
+def test_scan_tuples_matches_scan():
+    source = 'set x to 10\nif x >= 2 then print "a\\"b" end # done\n'
+    tokens = Lexer(source).scan()
+    expected = [(t.kind, t.lexeme, t.line, t.col) for t in tokens]
+    assert Lexer(source).scan_tuples() == expected
+
+
+def test_token_stream_matches_scan():
+    from compiler.parser import Parser
+
+    source = 'set x to 10\nif x >= 2 then print "a" end if\n'
+    tokens = Lexer(source).scan()
+    stream = Lexer(source).scan_stream()
+    assert len(stream) == len(tokens)
+    assert [stream[i] for i in range(len(stream))] == tokens
+    assert stream[-1].kind == TokenKind.EOF
+    assert Parser(stream).parse() == Parser(tokens).parse()
+
+
+def test_lexer_error_carries_position():
+    import pickle
+
+    with pytest.raises(LexerError) as info:
+        Lexer('x\n  "abc').scan()
+    err = info.value
+    assert (err.pos, err.line, err.col, err.msg) == (8, 2, 7, "Unterminated string")
+    assert str(err) == "Unterminated string at 2:7"
+    assert str(pickle.loads(pickle.dumps(err))) == str(err)
@@ -68,6 +68,16 @@ def test_parse_power():
     assert isinstance(assign.expr, ast_nodes.Power)
 
 
+def test_parse_folds_sign_into_number_literal():
+    log_feature("signed number literals")
+    values = parse("print -5, - -2.5, +3, -x").statements[0].values
+    assert [v.value for v in values[:3]] == ["-5", "2.5", "3"]
+    assert all(isinstance(v, ast_nodes.Number) for v in values[:3])
+    assert [v.is_float for v in values[:3]] == [False, True, False]
+    assert (values[0].line, values[0].col) == (1, 7)
+    assert isinstance(values[3], ast_nodes.Unary)
+
+
 def test_parse_declaration_and_input():
     log_feature("declaration with type and input")
     program = parse("make a as int\ninput a")
@@ -162,6 +172,15 @@ def test_parse_typed_set_and_add_phrase():
     assert second.expr.op == "+"
 
 
+def test_parse_add_phrase_falls_back_to_add_expression():
+    log_feature("add phrase backtracking")
+    program = parse("set y to add (1 + 2) and 3")
+    expr = program.statements[0].expr
+    assert isinstance(expr, ast_nodes.Binary) and expr.op == "add"
+    assert isinstance(expr.left, ast_nodes.Binary) and expr.left.op == "+"
+    assert expr.right.value == "3"
+
+
 def test_parse_inplace_add_and_sub():
     log_feature("in-place add and sub")
     code = "set x:int to 6\nadd 6 to x\nsub 2 from x"
@@ -174,3 +193,37 @@ def test_parse_inplace_add_and_sub():
     assert add_stmt.expr.op == "+"
     assert isinstance(sub_stmt, ast_nodes.Assign)
     assert sub_stmt.expr.op == "-"
+
+
+def test_parse_requires_eof_terminated_stream():
+    with pytest.raises(ParseError):
+        Parser([]).parse()
+    tokens = Lexer("print 1").scan()
+    with pytest.raises(ParseError):
+        Parser(tokens[:-1]).parse()
+
+
+def test_parse_long_power_and_not_chains():
+    program = parse("print 2 ^ 3 ^ 4")
+    power = program.statements[0].values[0]
+    assert isinstance(power, ast_nodes.Power)
+    assert power.base.value == "2"
+    assert isinstance(power.exponent, ast_nodes.Power)
+    assert (power.exponent.base.value, power.exponent.exponent.value) == ("3", "4")
+
+    # Chains longer than the recursion limit parse without blowing the stack.
+    parse("print " + " ^ ".join(["2"] * 5000))
+    cond = parse("if " + "not " * 5000 + "x == 1 then\nend if").statements[0]
+    node, depth = cond.first.cond, 0
+    while isinstance(node, ast_nodes.Unary):
+        node, depth = node.right, depth + 1
+    assert depth == 5000
+
+
+def test_every_node_exposes_position():
+    class Custom(ast_nodes.Expr):
+        pass
+
+    assert (Custom().line, Custom().col) == (None, None)
+    assert ast_nodes.Var("x").line is None
+    assert (ast_nodes.Var("x", 2, 5).line, ast_nodes.Var("x", 2, 5).col) == (2, 5)
@@ -10,6 +10,7 @@ if str(SRC) not in sys.path:
 
 from compiler.lexer import Lexer
 from compiler.parser import Parser
+from compiler import ast
 from compiler.semantic import Analyzer, SemanticError
 
 
@@ -64,6 +65,16 @@ def test_redeclaration_error():
         analyze("make x as int\nmake x as int")
 
 
+def test_block_scopes_shadow_and_unwind():
+    log_feature("block scoping")
+    # An inner block may redeclare an outer name; its names end with it.
+    analyze(
+        "make x as int\nwhile x < 1 do\n make x as string\n make y as int\nend while\nset x to 2"
+    )
+    with pytest.raises(SemanticError, match="undefined variable 'y'"):
+        analyze("make x as int\nwhile x < 1 do\n make y as int\nend while\nprint y")
+
+
 def test_input_requires_declaration():
     log_feature("input requires declaration")
     with pytest.raises(SemanticError):
@@ -125,3 +136,70 @@ def test_index_literal_out_of_bounds_write():
 def test_index_literal_in_bounds_ok():
     log_feature("index literal in bounds ok")
     analyze("make xs as list of size 2\nset xs[1] to 5\nset y to xs[1]")
+
+
+def test_constants_fold_where_values_are_used():
+    log_feature("constant folding")
+    code = 'function "f"(a)\n set b to 2 * 3\n return 1 + 1\nend function\nmake xs as list of size 4\nwhile xs[1 + 1] < 2 ^ 3 do\n print 1 + 2 * 3\nend while'
+    program = Parser(Lexer(code).scan()).parse()
+    Analyzer(code).analyze(program)
+    fn_body = program.functions[0].body
+    assert fn_body[0].expr.value == "6"
+    assert fn_body[1].values[0].op == "+"  # return values are left as written
+    loop = program.statements[1]
+    assert loop.cond.right.value == "8"
+    assert loop.cond.left.index.op == "+"  # indexes are never folded
+    assert loop.body[0].values[0].value == "7"
+
+
+def test_error_quotes_offending_source_line():
+    log_feature("error source context")
+    with pytest.raises(SemanticError) as exc:
+        analyze("set a to 1\r\nprint a\r\nprint b\r\n")
+    assert str(exc.value) == "undefined variable 'b' at 3:7\n    print b\n          ^"
+
+
+def test_parameter_defaults_see_only_earlier_parameters():
+    log_feature("parameter default scope")
+    analyze('function "f"(a:int, b = a, c:string = "x")\nend function')
+    with pytest.raises(SemanticError, match="undefined variable 'b'"):
+        analyze('function "f"(a = b, b:int)\nend function')
+    with pytest.raises(SemanticError, match="duplicate parameter 'a'"):
+        analyze('function "f"(a, a = 1)\nend function')
+
+
+def test_function_call_argument_binding_errors():
+    log_feature("function call argument binding")
+    fn = 'function "f"(a:int, b = 1, c:int, d:int)\nend function\n'
+    analyze(fn + 'call "f" with arguments:(1, d=4, c=3)')
+    with pytest.raises(SemanticError, match="missing argument for 'c'"):
+        analyze(fn + 'call "f" with arguments:(1)')
+    with pytest.raises(SemanticError, match="duplicate argument for 'a'"):
+        analyze(fn + 'call "f" with arguments:(1, a=2)')
+    with pytest.raises(SemanticError, match="unknown parameter 'e'"):
+        analyze(fn + 'call "f" with arguments:(e=2)')
+
+
+def test_index_negative_literal_out_of_bounds():
+    log_feature("negative literal index")
+    with pytest.raises(SemanticError, match="index -1 out of bounds"):
+        analyze("make xs as list of size 3\nset xs[-1] to 1")
+    with pytest.raises(SemanticError, match="index -1 out of bounds"):
+        analyze("make xs as list of size 3\nprint xs[-1]")
+    analyze("make xs as list of size 3\nprint xs[+2]")
+
+
+def test_unhandled_nodes_raise_semantic_error():
+    log_feature("unhandled node types")
+
+    class UnknownStmt(ast.Stmt):
+        pass
+
+    class UnknownExpr(ast.Expr):
+        pass
+
+    with pytest.raises(SemanticError, match="Unhandled statement"):
+        Analyzer("").analyze(ast.Program([], [UnknownStmt()]))
+    program = ast.Program([], [ast.Print([UnknownExpr()], 1, 1)])
+    with pytest.raises(SemanticError, match="Unhandled expr"):
+        Analyzer("print 1").analyze(program)